@@ -1,29 +1,37 @@
 from flask import Flask, redirect, url_for, request, render_template, flash
 from dotenv import load_dotenv
-import os, secrets
-from extensions import db, scheduler
+import os, secrets, multiprocessing
+import click
+
+# Load environment variables before the local modules read their settings
+load_dotenv()
+
+from extensions import db, scheduler, socketio
+from database import init_database
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from student import student_bp
 from hr import hr_bp
 
-# Load environment variables
-load_dotenv()
-
 def create_app():
     app = Flask(__name__)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///interview_app.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.secret_key = os.getenv("FLASK_SECRET_KEY", secrets.token_hex(16))
 
-    # Initialize extensions
-    db.init_app(app)
+    # Initialize extensions (database URL and pool settings come from DATABASE_URL / DB_*)
+    init_database(app, db)
     scheduler.init_app(app)
 
     # Blueprints
     app.register_blueprint(student_bp)
     app.register_blueprint(hr_bp)
 
+    # Real-time meeting channel. 'threading' by default: the LLM streams and
+    # evaluation workers use real threads, which eventlet would need monkey-patched
+    from meeting_socket import MeetingNamespace, MEETING_NAMESPACE
+    socketio.init_app(app, async_mode=os.getenv("SOCKETIO_ASYNC_MODE", "threading"))
+    socketio.on_namespace(MeetingNamespace(MEETING_NAMESPACE))
+
     # Login manager
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -62,7 +70,54 @@ def create_app():
         days=180  # Run every day
     )
 
-    scheduler.start()
+    # Spawned helper processes (resume parsing) re-import this module;
+    # only the main process runs the scheduler and evaluation workers
+    main_process = multiprocessing.current_process().name == 'MainProcess'
+    if main_process:
+        scheduler.start()
+
+    # Background evaluation of submitted interviews
+    from evaluation_worker import start_evaluation_workers, _worker_loop
+
+    @app.cli.command('evaluation-worker')
+    def evaluation_worker_command():
+        """Run an evaluation worker in the foreground (for EVAL_WORKERS=0 deployments)."""
+        _worker_loop(app)
+
+    if main_process:
+        start_evaluation_workers(app)
+
+    @app.cli.command('check-query-plans')
+    @click.option('--hrs', type=int, default=50, help='HRs in the synthetic dataset (40 interviews each).')
+    def check_query_plans_command(hrs):
+        """EXPLAIN the hot queries on a seeded in-memory database; fails on full scans or missing index ranges."""
+        from query_plans import check_query_plans
+        sizes, results = check_query_plans(hrs=hrs)
+        print(f"[QueryPlans] Seeded {sizes}")
+        for name, plan, ok in results:
+            print(f"[QueryPlans] {'ok  ' if ok else 'FAIL'} {name}: {' | '.join(plan)}")
+        failed = [name for name, _, ok in results if not ok]
+        if failed:
+            raise click.ClickException(f"Bad plans in: {', '.join(failed)}")
+
+    @app.cli.command('rebuild-attempts')
+    def rebuild_attempts_command():
+        """Recompute the per-candidate interview summaries from the answers."""
+        from interview_attempts import rebuild_attempts
+        print(f"[Attempts] Rebuilt {rebuild_attempts()} interview attempt(s)")
+
+    @app.cli.command('ingest-resumes')
+    @click.argument('path', type=click.Path(exists=True))
+    @click.option('--workers', type=int, default=None, help='Parser processes (default: CPU count).')
+    @click.option('--batch-size', type=int, default=None, help='Students upserted per transaction.')
+    def ingest_resumes_command(path, workers, batch_size):
+        """Create/update Students from a directory or zip of PDF/DOCX resumes."""
+        from resume_ingest import ingest_resumes
+        stats = ingest_resumes(path, workers=workers, batch_size=batch_size)
+        print(f"[Ingest] {stats['files']} file(s), {stats['parsed']} parsed, {stats['skipped']} already ingested, "
+              f"{stats['failed']} failed, {stats['no_email']} without email")
+        print(f"[Ingest] {stats['created']} student(s) created, {stats['updated']} updated")
+        print(f"[Ingest] {stats['seconds']}s, {stats['files_per_second']} files/s, {stats['mb_per_second']} MB/s")
 
     return app
 
@@ -75,4 +130,4 @@ def index():
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    socketio.run(app, host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,93 @@
+"""
+Cost of creating a candidate's QuestionAnswer rows, per-row flush vs bulk.
+
+  per-row flush  session.add() + flush() per question, to read back each id
+                 (what start_interview and hr_dashboard did)
+  bulk           hr.insert_questions: one multi-row INSERT ... RETURNING id, text
+
+Each run creates the rows for `--candidates` candidates on a fresh SQLite file
+(WAL, as configured by database.py) and commits once per candidate, like
+start_interview. Run from the repository root:
+
+    python benchmarks/question_inserts.py --questions 5 20 100 --candidates 200
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def per_row_flush(db, QuestionAnswer, texts, interview_id, student_id):
+    qa_ids = []
+    for q_text in texts:
+        qa = QuestionAnswer(text=q_text, interview_id=interview_id, student_id=student_id)
+        db.session.add(qa)
+        db.session.flush()
+        qa_ids.append(qa.id)
+    return qa_ids
+
+
+def bulk(db, QuestionAnswer, texts, interview_id, student_id):
+    import hr
+    return hr.insert_questions(texts, interview_id, student_id)
+
+
+def run(create_rows, questions, candidates):
+    """Seconds and INSERT statements for `candidates` candidates of `questions` questions each."""
+    from flask import Flask
+    from database import init_database
+    from extensions import db
+    from models import Interview, QuestionAnswer
+
+    path = os.path.join(tempfile.mkdtemp(prefix='qa-bench-'), 'bench.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    init_database(app, db)
+
+    with app.app_context():
+        db.create_all()
+        interview = Interview(link_id='bench', type='custom')
+        db.session.add(interview)
+        db.session.commit()
+        interview_id = interview.id
+
+        inserts = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: inserts.append(statement.startswith('INSERT')))
+        texts = [f"Benchmark question {n}?" for n in range(questions)]
+        started = time.perf_counter()
+        for student_id in range(1, candidates + 1):
+            qa_ids = create_rows(db, QuestionAnswer, texts, interview_id, student_id)
+            db.session.commit()
+            assert len(qa_ids) == questions
+        seconds = time.perf_counter() - started
+        db.session.remove()
+        db.engine.dispose()
+    return seconds, sum(inserts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, nargs='+', default=[5, 20, 100],
+                        help='questions per candidate')
+    parser.add_argument('--candidates', type=int, default=200, help='candidates (commits) per run')
+    args = parser.parse_args()
+    import hr  # noqa: F401 -- imported up front so the first bulk run doesn't time it
+
+    print(f"{args.candidates} candidates per run, one commit each")
+    print(f"{'questions':>9} | {'per-row ms':>10} | {'INSERTs':>7} | {'bulk ms':>8} | {'INSERTs':>7} | {'speedup':>7}")
+    for questions in args.questions:
+        row_seconds, row_inserts = run(per_row_flush, questions, args.candidates)
+        bulk_seconds, bulk_inserts = run(bulk, questions, args.candidates)
+        print(f"{questions:>9} | {row_seconds * 1000 / args.candidates:>10.2f} | "
+              f"{row_inserts // args.candidates:>7} | {bulk_seconds * 1000 / args.candidates:>8.2f} | "
+              f"{bulk_inserts // args.candidates:>7} | {row_seconds / bulk_seconds:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
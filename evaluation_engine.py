@@ -0,0 +1,132 @@
+import os
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from llm_model import evaluate_answer, evaluate_answers_batch, chunk_pairs
+from prescorer import prescore_answers
+
+
+# Max number of LLM evaluations in flight at once (shared by all requests)
+EVAL_CONCURRENCY = int(os.getenv("LLM_EVAL_CONCURRENCY", 4))
+# Seconds allowed for a single evaluation call
+EVAL_TIMEOUT = float(os.getenv("LLM_EVAL_TIMEOUT", 30))
+# Seconds an uncollected per-answer evaluation is kept around
+INFLIGHT_TTL = int(os.getenv("LLM_EVAL_INFLIGHT_TTL", 3 * 3600))
+
+_executor = None
+# Futures of keyed background evaluations, for collect() in this same process only:
+# other processes (e.g. the evaluation worker) never see them
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def get_executor():
+    """Lazily create the shared, bounded pool used for LLM evaluations."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=EVAL_CONCURRENCY, thread_name_prefix="llm-eval")
+    return _executor
+
+
+def evaluate_pairs(items, timeout=None, ideal_answers=None):
+    """
+    Evaluate many answers with as few, concurrent LLM calls as possible.
+
+    `items` is a list of (key, question, answer) tuples. Clear-cut answers are
+    scored locally by the prescorer (using `ideal_answers`, question -> known
+    ideal answer, when given); the rest are grouped into batch prompts and the
+    batches run on the shared pool. Returns a dict of
+    key -> (ideal_answer, score) for every evaluation that finished in time;
+    keys that timed out or were deferred because the LLM is unavailable are
+    left out so the caller can keep them pending.
+    """
+    if not items:
+        return {}
+
+    timeout = timeout or EVAL_TIMEOUT
+    executor = get_executor()
+    started = time.monotonic()
+
+    results = {}
+    prescored = prescore_answers([(question, answer) for _, question, answer in items], ideal_answers)
+    for (key, _, _), result in zip(items, prescored):
+        if result is not None:
+            results[key] = result
+    total = len(items)
+    items = [item for item, result in zip(items, prescored) if result is None]
+
+    futures = {}
+    for chunk in chunk_pairs([(question, answer) for _, question, answer in items]):
+        batch = [items[i] for i in chunk]
+        future = executor.submit(evaluate_answers_batch, [(q, a) for _, q, a in batch], timeout)
+        futures[future] = [key for key, _, _ in batch]
+
+    # Every call gets `timeout` seconds once it reaches a worker, and a batch may
+    # need one retry round, so the whole run is bounded by the pool's "waves".
+    waves = math.ceil(len(futures) / EVAL_CONCURRENCY)
+    done, not_done = wait(futures, timeout=timeout * waves * 2)
+
+    for future in done:
+        keys = futures[future]
+        try:
+            results.update((key, result) for key, result in zip(keys, future.result()) if result is not None)
+        except Exception as e:
+            print(f"Evaluation failed for {keys}: {e}")
+
+    for future in not_done:
+        future.cancel()
+        print(f"Evaluation timed out for {futures[future]}")
+
+    print(f"Evaluated {len(results)}/{total} answers ({total - len(items)} prescored) "
+          f"in {len(futures)} batch(es) in {time.monotonic() - started:.2f}s")
+    return results
+
+
+def _evaluate_one(question, answer, on_result):
+    result = prescore_answers([(question, answer)])[0] or evaluate_answer(question, answer, EVAL_TIMEOUT)
+    if on_result:
+        on_result(result)
+    return result
+
+
+def submit_evaluation(key, question, answer, on_result=None):
+    """
+    Start scoring one answer in the background as soon as it is submitted.
+
+    `on_result(result)` runs on the worker thread once the score is in; use it
+    to store the result where any process can read it. With a `key`, the
+    future is also kept until collect() picks it up in this process;
+    submitting the same key again (an edited answer) replaces the earlier
+    evaluation.
+    """
+    now = time.monotonic()
+    future = get_executor().submit(_evaluate_one, question, answer, on_result)
+    if key is None:
+        return future
+    with _inflight_lock:
+        for stale in [k for k, (_, submitted) in _inflight.items() if now - submitted > INFLIGHT_TTL]:
+            del _inflight[stale]
+        _inflight[key] = (future, now)
+    return future
+
+
+def collect(keys, timeout=None):
+    """
+    Wait for the background evaluations under `keys` (only those still in
+    flight take any time) and return key -> (ideal_answer, score) for the ones
+    that succeeded. Only evaluations submitted by this process are found; the
+    caller scores the rest itself. Collected keys are forgotten.
+    """
+    with _inflight_lock:
+        futures = {key: _inflight.pop(key)[0] for key in keys if key in _inflight}
+    if not futures:
+        return {}
+
+    wait(futures.values(), timeout=timeout or EVAL_TIMEOUT)
+    results = {}
+    for key, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            results[key] = future.result()
+    return results
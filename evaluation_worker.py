@@ -0,0 +1,178 @@
+import os
+import datetime
+import threading
+
+from sqlalchemy import or_, select
+
+from extensions import db
+from models import EvaluationJob, Interview, QuestionAnswer, Student
+from email_utils import send_confirmation_email
+
+
+# Worker threads started with the web app (0 = run `flask evaluation-worker` separately)
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", 2))
+# Seconds an idle worker sleeps between polls of the job table
+EVAL_POLL_INTERVAL = float(os.getenv("EVAL_POLL_INTERVAL", 2))
+# Seconds a worker owns a job; a job still "running" after that is picked up again
+EVAL_JOB_LEASE = int(os.getenv("EVAL_JOB_LEASE", 300))
+EVAL_JOB_MAX_ATTEMPTS = int(os.getenv("EVAL_JOB_MAX_ATTEMPTS", 5))
+# Seconds before a job whose answers were deferred (LLM unavailable) is retried
+EVAL_JOB_RETRY_DELAY = int(os.getenv("EVAL_JOB_RETRY_DELAY", 60))
+# Seconds a job's first run waits for answers still being scored in the background
+EVAL_SCORE_WAIT = float(os.getenv("EVAL_SCORE_WAIT", 30))
+
+_wakeup = threading.Event()
+_started = False
+
+
+def enqueue_evaluation(interview_id, student_id):
+    """Queue evaluation of a candidate's answers. Caller commits."""
+    job = EvaluationJob.query.filter(
+        EvaluationJob.interview_id == interview_id,
+        EvaluationJob.student_id == student_id,
+        EvaluationJob.status.in_([EvaluationJob.PENDING, EvaluationJob.RUNNING])
+    ).first()
+    if job:
+        return job
+
+    now = datetime.datetime.utcnow()
+    job = EvaluationJob(interview_id=interview_id, student_id=student_id,
+                        status=EvaluationJob.PENDING, created_at=now, updated_at=now)
+    db.session.add(job)
+    _wakeup.set()
+    return job
+
+
+def pending_answer_count(interview_id, student_id):
+    return QuestionAnswer.query.filter(
+        QuestionAnswer.interview_id == interview_id,
+        QuestionAnswer.student_id == student_id,
+        QuestionAnswer.answer_text.isnot(None),
+        QuestionAnswer.answer_text != '',
+        or_(QuestionAnswer.llm_answer_text.is_(None), QuestionAnswer.score.is_(None))
+    ).count()
+
+
+def runnable_job_queries(now, limit=5):
+    """
+    The oldest `limit` jobs of each runnable kind: new, due for a retry, and
+    running with an expired lease. One query per kind, so each is a search of
+    ix_evaluation_job_status_locked_until_id (new jobs come out of it already
+    in id order); a single OR of the three made the database scan the whole
+    table in id order.
+    """
+    job = EvaluationJob
+    return [
+        select(job).where(job.status == job.PENDING, job.locked_until.is_(None)).order_by(job.id).limit(limit),
+        select(job).where(job.status == job.PENDING, job.locked_until <= now).order_by(job.id).limit(limit),
+        select(job).where(job.status == job.RUNNING, job.locked_until <= now).order_by(job.id).limit(limit),
+    ]
+
+
+def claim_next_job():
+    """Atomically take the oldest runnable job: pending and due, or running with an expired lease."""
+    now = datetime.datetime.utcnow()
+    candidates = [job for query in runnable_job_queries(now) for job in db.session.scalars(query)]
+    for job in sorted(candidates, key=lambda job: job.id)[:5]:
+        # Compare-and-set on the fields we read, so only one worker wins the job
+        claimed = EvaluationJob.query.filter_by(
+            id=job.id, status=job.status, locked_until=job.locked_until
+        ).update({
+            'status': EvaluationJob.RUNNING,
+            'attempts': EvaluationJob.attempts + 1,
+            'locked_until': now + datetime.timedelta(seconds=EVAL_JOB_LEASE),
+            'updated_at': now,
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return db.session.get(EvaluationJob, job.id, populate_existing=True)
+    return None
+
+
+def run_job(job):
+    # Imported here because hr imports this module to enqueue jobs
+    from hr import evaluate_all_answers
+
+    try:
+        evaluate_all_answers(job.interview_id, job.student_id,
+                             score_wait=EVAL_SCORE_WAIT if job.attempts == 1 else 0)
+    except Exception as e:
+        db.session.rollback()
+        print(f"[EvalWorker] Job {job.id} failed: {e}")
+        _finish(job, error=str(e))
+        return
+
+    remaining = pending_answer_count(job.interview_id, job.student_id)
+    if remaining:
+        _finish(job, error=f"{remaining} answer(s) still pending")
+        return
+
+    if not job.email_sent:
+        interview = db.session.get(Interview, job.interview_id)
+        student = db.session.get(Student, job.student_id)
+        try:
+            send_confirmation_email(student.email, student.name, interview)
+        except Exception as e:
+            # The answers are scored; the retry only sends the email again
+            print(f"Failed to send confirmation email: {e}")
+            _finish(job, error=f"Confirmation email failed: {e}")
+            return
+        job.email_sent = True
+
+    _finish(job)
+
+
+def _finish(job, error=None):
+    now = datetime.datetime.utcnow()
+    job.updated_at = now
+    job.last_error = error
+    if error is None:
+        job.status = EvaluationJob.DONE
+        job.locked_until = None
+    elif job.attempts >= EVAL_JOB_MAX_ATTEMPTS:
+        job.status = EvaluationJob.FAILED
+        job.locked_until = None
+    else:
+        job.status = EvaluationJob.PENDING
+        job.locked_until = now + datetime.timedelta(seconds=EVAL_JOB_RETRY_DELAY * job.attempts)
+    db.session.commit()
+    print(f"[EvalWorker] Job {job.id} -> {job.status}" + (f" ({error})" if error else ""))
+
+
+def process_available_jobs():
+    """Run jobs until none are runnable. Returns how many were processed."""
+    processed = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return processed
+        run_job(job)
+        processed += 1
+
+
+def _worker_loop(app):
+    while True:
+        try:
+            with app.app_context():
+                processed = process_available_jobs()
+                db.session.remove()
+        except Exception as e:
+            print(f"[EvalWorker] Error: {getattr(e, 'orig', None) or e}")
+            processed = 0
+        if not processed:
+            _wakeup.wait(EVAL_POLL_INTERVAL)
+            _wakeup.clear()
+
+
+def start_evaluation_workers(app, workers=EVAL_WORKERS):
+    """
+    Start the worker threads. Jobs are leased rather than locked, so anything a
+    crashed process left "running" is retried once its lease runs out.
+    """
+    global _started
+    if _started or workers <= 0:
+        return
+    _started = True
+    for i in range(workers):
+        threading.Thread(target=_worker_loop, args=(app,), name=f"eval-worker-{i}", daemon=True).start()
+    print(f"[EvalWorker] Started {workers} evaluation worker(s)")
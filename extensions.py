@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_apscheduler import APScheduler
+from flask_socketio import SocketIO
 
 db = SQLAlchemy()
 scheduler = APScheduler()
+socketio = SocketIO()
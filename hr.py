@@ -1,16 +1,42 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, abort
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, abort, current_app
+from flask import Response, stream_template, stream_with_context, get_flashed_messages
+import os
 import uuid
+import json
+import random
+import hashlib
 import datetime
-from models import db, User, UserType, HR, Interview, QuestionAnswer, Student
-from llm_model import model, evaluate_answer
+import time
+from collections import defaultdict, deque
+from extensions import scheduler
+from models import db, User, UserType, HR, Interview, QuestionAnswer, Student, EvaluationJob, InterviewAttempt
+from llm_model import generate_text, evaluate_answer
+from llm_cache import cache as llm_cache
+from llm_resilience import LLMUnavailableError, stats as llm_resilience_stats
+from resume_utils import resume_stats
+from prescorer import prescore_stats
+import llm_metrics
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
+from sqlalchemy import and_, func, insert
 from sqlalchemy.orm import joinedload
-from email_utils import send_confirmation_email
+from evaluation_engine import evaluate_pairs, submit_evaluation
+from question_stream import start_question_stream, wait_for_questions
+from interview_state import create_state, get_state, save_state, state_stats
+from evaluation_worker import enqueue_evaluation, EVAL_POLL_INTERVAL
+from interview_attempts import refresh_attempt
+from pagination import InterviewPage
 
 hr_bp = Blueprint('hr', __name__)
 login_manager = LoginManager()
 login_manager.login_view = 'hr'
 
+# Minimum number of AI questions generated into an interview's question pool
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", 20))
+DEFAULT_NUM_QUESTIONS = 5
+# Interviews read per chunk while /hr/export streams the CSV
+HR_EXPORT_CHUNK = int(os.getenv("HR_EXPORT_CHUNK", 200))
+GENERATION_ERROR_QUESTIONS = ["Error generating questions."]
+
 
 def get_or_create_hr(current_user):
     """Helper function to get or create HR record for current user"""
@@ -25,6 +51,17 @@ def get_or_create_hr(current_user):
 
 
 
+def stream_page(template, **context):
+    """
+    Render `template` with stream_template. Flashed messages are read first:
+    the session cookie goes out before the body, so popping them while the
+    page streams wouldn't stick.
+    """
+    get_flashed_messages(with_categories=True)
+    return stream_template(template, **context)
+
+
+
 # HR registration
 @hr_bp.route('/hr/register', methods=['GET', 'POST'])
 def hr_register():
@@ -111,6 +148,7 @@ def hr_dashboard():
 
         job_title = request.form.get('job_title')
         company_name = request.form.get('company_name')
+        num_questions = request.form.get('num_questions', type=int)
         link_id = str(uuid.uuid4())
 
         # Get or create HR record
@@ -123,6 +161,7 @@ def hr_dashboard():
             custom_questions=custom_questions,
             job_title=job_title,
             company_name=company_name,
+            num_questions=num_questions,
             hr_id=hr.id,
             created_at=datetime.datetime.utcnow(),
             used=False
@@ -132,11 +171,12 @@ def hr_dashboard():
 
         # Add custom questions
         if custom_questions:
-            for q_text in [q.strip() for q in custom_questions.split(',') if q.strip()]:
-                qa = QuestionAnswer(text=q_text, interview_id=interview.id)
-                db.session.add(qa)
+            insert_questions([q.strip() for q in custom_questions.split(',') if q.strip()], interview.id)
             db.session.commit()
 
+        # Generate the AI question pool in the background so candidates don't wait for it
+        schedule_question_pool(interview)
+
         link = url_for('hr.start_interview', link_id=link_id, _external=True)
         flash(f'Interview created successfully! Share this link with candidates: {link}', 'success')
         return render_template('hr/hr_dashboard.html')
@@ -145,8 +185,8 @@ def hr_dashboard():
 
 
 # AI question generation
-def generate_ai_questions(job_desc, num=5):
-    prompt = f"""
+def ai_questions_prompt(job_desc, num=5):
+    return f"""
     Generate exactly {num} technical interview questions based on this job description:
     {job_desc}
 
@@ -155,12 +195,120 @@ def generate_ai_questions(job_desc, num=5):
     1. What is object-oriented programming?
     2. Explain the concept of inheritance.
     """
+
+
+def generate_ai_questions(job_desc, num=5):
+    prompt = ai_questions_prompt(job_desc, num)
     try:
-        response = model.generate_content(prompt)
-        return [line.split(' ', 1)[-1].strip() for line in response.text.strip().splitlines() if line]
+        text = generate_text(prompt, operation='generate_ai_questions')
+        return [line.split(' ', 1)[-1].strip() for line in text.strip().splitlines() if line]
     except Exception as e:
         print("LLM error:", str(e))
-        return ["Error generating questions."]
+        return list(GENERATION_ERROR_QUESTIONS)
+
+
+def question_pool_source(job_desc):
+    return hashlib.sha256((job_desc or '').strip().encode('utf-8')).hexdigest()
+
+
+def schedule_question_pool(interview):
+    """Queue a background (re)build of the interview's AI question pool."""
+    if interview.type not in ['jd', 'both'] or not interview.job_desc:
+        return
+    scheduler.add_job(
+        id=f'question_pool_{interview.id}',
+        func=run_build_question_pool_job,
+        args=[interview.id],
+        replace_existing=True
+    )
+
+
+def run_build_question_pool_job(interview_id):
+    with scheduler.app.app_context():
+        build_question_pool(interview_id)
+
+
+def build_question_pool(interview_id):
+    interview = db.session.get(Interview, interview_id)
+    if not interview or not interview.job_desc:
+        return
+
+    source = question_pool_source(interview.job_desc)
+    num = interview.num_questions or DEFAULT_NUM_QUESTIONS
+    if interview.question_pool_source == source and len(json.loads(interview.question_pool or '[]')) >= num:
+        return
+
+    questions = generate_ai_questions(interview.job_desc, num=max(QUESTION_POOL_SIZE, num * 2))
+    if questions == GENERATION_ERROR_QUESTIONS:
+        print(f"Question pool generation failed for interview {interview_id}")
+        return
+
+    # The job description may have been edited while we were generating
+    db.session.refresh(interview)
+    if question_pool_source(interview.job_desc) != source:
+        return
+
+    interview.question_pool = json.dumps(questions)
+    interview.question_pool_source = source
+    db.session.commit()
+    print(f"Built question pool of {len(questions)} for interview {interview_id}")
+
+
+def draw_pool_questions(interview, num):
+    """Pick `num` questions from the interview's pool, or None if the pool isn't usable yet."""
+    if not interview.question_pool or interview.question_pool_source != question_pool_source(interview.job_desc):
+        return None
+    pool = json.loads(interview.question_pool)
+    if len(pool) < num:
+        return None
+    return random.sample(pool, num)
+
+def insert_questions(texts, interview_id, student_id=None):
+    """
+    Create the QuestionAnswer rows for `texts` with one multi-row INSERT and
+    return their ids in order. Caller commits.
+    """
+    if not texts:
+        return []
+    rows = [{'text': text, 'interview_id': interview_id, 'student_id': student_id} for text in texts]
+    dialect = db.session.get_bind().dialect
+    if dialect.insert_returning and dialect.use_insertmanyvalues:
+        # INSERT ... VALUES (...), (...) RETURNING id, text. The database doesn't promise
+        # to return rows in VALUES order (and asking SQLAlchemy to restore it makes it send
+        # one INSERT per row on SQLite), so ids are matched to questions by their text
+        created = db.session.execute(insert(QuestionAnswer).returning(QuestionAnswer.id, QuestionAnswer.text), rows)
+    else:
+        # No RETURNING: read back the rows this candidate got past the newest one before
+        candidate = and_(QuestionAnswer.interview_id == interview_id, QuestionAnswer.student_id == student_id)
+        newest = db.session.query(func.max(QuestionAnswer.id)).filter(candidate).scalar() or 0
+        db.session.execute(insert(QuestionAnswer), rows)
+        created = db.session.query(QuestionAnswer.id, QuestionAnswer.text) \
+            .filter(candidate, QuestionAnswer.id > newest)
+
+    # Rows with the same text are interchangeable, so repeated questions just take ids in turn
+    ids_by_text = defaultdict(deque)
+    for qa_id, text in sorted(created):
+        ids_by_text[text].append(qa_id)
+    return [ids_by_text[text].popleft() for text in texts]
+
+
+def candidate_questions(interview_id, student_id):
+    """(id, text) of a candidate's questions in order; a new read transaction, so polls see new rows."""
+    db.session.commit()
+    return db.session.query(QuestionAnswer.id, QuestionAnswer.text) \
+        .filter_by(interview_id=interview_id, student_id=student_id).order_by(QuestionAnswer.id).all()
+
+
+def store_streamed_question(app, interview_id, student_id):
+    """Callback that saves the newest streamed question as the candidate's next QuestionAnswer row."""
+    def store(questions):
+        with app.app_context():
+            insert_questions(questions[-1:], interview_id, student_id)
+            refresh_attempt(interview_id, student_id)
+            db.session.commit()
+            db.session.remove()
+    return store
+
 
 # Start interview
 @hr_bp.route('/hr/interview/<link_id>', methods=['GET', 'POST'])
@@ -194,24 +342,46 @@ def start_interview(link_id):
 
         # Prepare questions as before
         questions = []
-        if interview.type in ['jd', 'both']:
-            questions += generate_ai_questions(interview.job_desc, num=interview.num_questions)
+        custom = []
+        stream_id = None
         if interview.type in ['custom', 'both']:
-            questions += [qa.strip() for qa in interview.custom_questions.split(',') if qa.strip()]
-
-        qa_ids = []
-        for q_text in questions:
-            qa = QuestionAnswer(text=q_text, interview_id=interview.id, student_id=student.id)
-            db.session.add(qa)
-            db.session.flush()
-            qa_ids.append(qa.id)
-
+            custom = [qa.strip() for qa in (interview.custom_questions or '').split(',') if qa.strip()]
+        if interview.type in ['jd', 'both']:
+            num = interview.num_questions or DEFAULT_NUM_QUESTIONS
+            pool_questions = draw_pool_questions(interview, num)
+            if pool_questions is None:
+                # Pool not ready (or stale) — stream the questions so the meeting can start
+                # on the first one, and refresh the pool for the next candidate. Each question
+                # is stored as a QuestionAnswer row as it arrives, so any process can serve it
+                stream_id = start_question_stream(
+                    ai_questions_prompt(interview.job_desc, num), num,
+                    fallback="Technical question based on the job description.", extra=custom,
+                    on_question=store_streamed_question(current_app._get_current_object(), interview.id, student.id)
+                )
+                total = num + len(custom)
+                schedule_question_pool(interview)
+            else:
+                questions += pool_questions
+        if stream_id is None:
+            questions += custom
+            total = len(questions)
+
+        qa_ids = insert_questions(questions, interview.id, student.id)
+        refresh_attempt(interview.id, student.id)
         db.session.commit()
 
         session.clear()
-        session['qa_ids'] = qa_ids
-        session['current_index'] = 0
-        session['link_id'] = link_id
+        # Interview state lives server-side; the cookie only carries its id
+        create_state('hr', {
+            'qa_ids': qa_ids,
+            'questions': questions,
+            'current_index': 0,
+            'link_id': link_id,
+            'interview_id': interview.id,
+            'student_id': student.id,
+            'question_stream_id': stream_id,
+            'questions_total': total,
+        })
 
         return redirect(url_for('hr.hr_meeting', link_id=link_id))
 
@@ -221,75 +391,175 @@ def start_interview(link_id):
 # Meeting page
 @hr_bp.route('/hr/meeting/<link_id>', methods=['GET'])
 def hr_meeting(link_id):
-    inteview = Interview.query.filter_by(link_id=link_id).first_or_404()
+    inteview = preload_interview(link_id)
+    if inteview is None:
+        abort(404)
     return render_template('hr/meeting.html', interview = inteview)
 
+
+def preload_interview(link_id):
+    """
+    Load the interview and the candidate's questions in one query and keep them
+    in the interview state, so the meeting's API calls don't query per question.
+    """
+    state = get_state('hr')
+    student_id = state.get('student_id') if state and state.get('link_id') == link_id else None
+    rows = db.session.query(Interview, QuestionAnswer.id, QuestionAnswer.text) \
+        .outerjoin(QuestionAnswer, and_(QuestionAnswer.interview_id == Interview.id,
+                                        QuestionAnswer.student_id == student_id)) \
+        .filter(Interview.link_id == link_id) \
+        .order_by(QuestionAnswer.id).all()
+    if not rows:
+        return None
+
+    if student_id:
+        qa_ids = [qa_id for _, qa_id, _ in rows if qa_id is not None]
+        questions = [text for _, qa_id, text in rows if qa_id is not None]
+        if qa_ids != state.get('qa_ids') or questions != state.get('questions'):
+            state['qa_ids'], state['questions'] = qa_ids, questions
+            save_state('hr', state)
+    return rows[0][0]
+
 # Next question API
 @hr_bp.route('/hr/get_next_question', methods=['POST'])
 def get_next_question():
-    qa_ids = session.get('qa_ids')
-    index = session.get('current_index', 0)
+    payload, status = next_question_payload()
+    return jsonify(payload), status
+
+
+def next_question_payload():
+    """Serve the candidate's next question as (payload, http_status); shared with the Socket.IO meeting."""
+    state = get_state('hr') or {}
+    qa_ids = state.setdefault('qa_ids', [])
+    index = state.get('current_index', 0)
+    total = state.get('questions_total', len(qa_ids))
 
     # Check if session data exists
-    if not qa_ids:
-        return jsonify({"status": "error", "message": "No questions found in session."}), 400
+    if not total:
+        return {"status": "error", "message": "No questions found in session."}, 400
+
+    questions = state.setdefault('questions', [])
+
+    # Read the questions the background generator has stored since the last call
+    if index >= len(qa_ids) and len(qa_ids) < total:
+        rows = wait_for_questions(state.get('question_stream_id'),
+                                  lambda: candidate_questions(state['interview_id'], state['student_id']), index + 1)
+        qa_ids[:] = [qa_id for qa_id, _ in rows]
+        questions[:] = [text for _, text in rows]
 
     # Check if interview is complete
     if index >= len(qa_ids):
-        return jsonify({"status": "complete"})
-
-    # Fetch question by id
-    qa = QuestionAnswer.query.get(qa_ids[index])
+        return {"status": "complete"}, 200
 
-    if not qa:
-        return jsonify({"status": "error", "message": f"Question ID {qa_ids[index]} not found."}), 404
+    # Question texts are preloaded with the interview; load them in one query if they're missing
+    if len(questions) < len(qa_ids):
+        texts = dict(db.session.query(QuestionAnswer.id, QuestionAnswer.text).filter(QuestionAnswer.id.in_(qa_ids)))
+        questions[:] = [texts.get(qa_id) for qa_id in qa_ids]
+    if questions[index] is None:
+        return {"status": "error", "message": f"Question ID {qa_ids[index]} not found."}, 404
 
     # Increment index for next call
     # print(f"get_next_question: Current index {index}, Total questions {len(qa_ids)}")
 
     response = {
         "status": "question",
-        "question": qa.text,
+        "question": questions[index],
         "index": index,
-        "total": len(qa_ids)
+        "total": total
     }
-    session['current_index'] = index + 1  # Update index in session
+    state['current_index'] = index + 1  # Update index in the interview state
+    save_state('hr', state)
 
 
     # Return the question
-    return jsonify(response)
+    return response, 200
 
 
 # Submit answer
 @hr_bp.route('/hr/submit_answer', methods=['POST'])
 def submit_answer():
     data = request.get_json()
-    qa_ids = session.get('qa_ids', [])
-    index = data.get('index')
+    payload, status = record_answer(data.get('index'), data.get('answer'))
+    return jsonify(payload), status
 
-    if index >= len(qa_ids):
-        return jsonify({'status': 'error', 'message': 'Invalid question index.'}), 400
 
-    qa = QuestionAnswer.query.get(qa_ids[index])
-    qa.answer_text = data.get('answer')
+def record_answer(index, answer, on_evaluated=None):
+    """
+    Save the answer to question `index` and start scoring it; returns (payload, http_status).
+    `on_evaluated(progress)` is called once the background evaluation is stored.
+    """
+    state = get_state('hr') or {}
+    qa_ids = state.get('qa_ids', [])
+    total = state.get('questions_total', len(qa_ids))
+
+    if index is None or index >= len(qa_ids):
+        return {'status': 'error', 'message': 'Invalid question index.'}, 400
+
+    # Update by id: the question text and ids are already in the interview state
+    qa_id = qa_ids[index]
+    last = index == total - 1
+    QuestionAnswer.query.filter_by(id=qa_id).update({'answer_text': answer}, synchronize_session=False)
+    refresh_attempt(state['interview_id'], state['student_id'], completed=last)
     db.session.commit()
 
-    # If this was the last answer — trigger evaluation
+    # Start scoring this answer now so it overlaps with the remaining questions;
+    # the score is stored on its row, where the evaluation worker reads it
+    if answer:
+        submit_evaluation(None, state['questions'][index], answer,
+                          on_result=store_answer_evaluation(current_app._get_current_object(), qa_id,
+                                                            answer, on_evaluated))
+
+    # If this was the last answer — queue evaluation and the confirmation email
     # print(f"submit_answer: Current index {index}, Total questions {len(qa_ids)}")
-    if index == len(qa_ids) - 1:
-        interview = Interview.query.filter_by(link_id=session.get('link_id')).first()
-        interview.used = True
-        print(f"submit_answer: Evaluating answers for interview {qa.interview_id} and student {qa.student_id}")
-        evaluate_all_answers(qa.interview_id, qa.student_id)
-        student = Student.query.get(qa.student_id)
+    if last:
+        interview_id, student_id = state['interview_id'], state['student_id']
+        Interview.query.filter_by(id=interview_id).update({'used': True}, synchronize_session=False)
+        print(f"submit_answer: Queueing evaluation for interview {interview_id} and student {student_id}")
+        enqueue_evaluation(interview_id, student_id)
+        db.session.commit()
+        return {
+            'status': 'success',
+            'evaluation_status_url': url_for('hr.evaluation_status', link_id=state['link_id'])
+        }, 200
 
-        # Send confirmation email
-        try:
-            send_confirmation_email(student.email, student.name, interview)
-        except Exception as e:
-            print(f"Failed to send confirmation email: {e}")
+    return {'status': 'success'}, 200
 
-    return jsonify({'status': 'success'})
+
+# Save an answer and get the next question in one round trip
+@hr_bp.route('/hr/answer_and_next', methods=['POST'])
+def answer_and_next():
+    data = request.get_json()
+    answer_payload, status = record_answer(data.get('index'), data.get('answer'))
+    if status != 200:
+        return jsonify({'answer': answer_payload}), status
+    next_payload, status = next_question_payload()
+    return jsonify({'answer': answer_payload, 'next': next_payload}), status
+
+
+# Evaluation progress for the candidate's finished interview
+@hr_bp.route('/hr/evaluation_status/<link_id>')
+def evaluation_status(link_id):
+    interview = Interview.query.filter_by(link_id=link_id).first_or_404()
+    state = get_state('hr') or {}
+    student_id = state.get('student_id') if state.get('link_id') == link_id else None
+    if not student_id:
+        return jsonify({'status': 'error', 'message': 'No interview found in session.'}), 400
+
+    return jsonify(evaluation_progress(interview.id, student_id))
+
+
+def evaluation_progress(interview_id, student_id):
+    job = EvaluationJob.query.filter_by(interview_id=interview_id, student_id=student_id) \
+        .order_by(EvaluationJob.id.desc()).first()
+    attempt = db.session.get(InterviewAttempt, (interview_id, student_id), populate_existing=True)
+
+    return {
+        'status': job.status if job else 'not_started',
+        'attempts': job.attempts if job else 0,
+        'total': attempt.question_count if attempt else 0,
+        'answered': attempt.answered_count if attempt else 0,
+        'evaluated': attempt.evaluated_count if attempt else 0,
+    }
 
 
 # Analytics
@@ -307,37 +577,36 @@ def hr_analytics():
     pending_interviews = total_interviews - completed_interviews
     unique_hrs = HR.query.count()
 
-    # Collect student interview details
-    interviews = Interview.query.filter_by(hr_id=hr.id).all()
-
-    student_interviews = []
-    for interview in interviews:
-        student = interview.student
-        if not student:
-            continue
-        qa_pairs = []
-        for qa in interview.qa_pairs:
-            qa_pairs.append({
-                'question': qa.text,
-                'answer': qa.answer_text or '—',
-                'llm_answer': qa.llm_answer_text or '—',
-                'score': qa.score if qa.score is not None else '—'
-            })
-
-        student_interviews.append({
-            'student_name': student.name,
-            'student_email': student.email,
-            'student_phone': student.phone,
-            'qa_pairs': qa_pairs
-        })
-
-    return render_template(
+    # One pre-aggregated row per candidate attempt, for a page of interviews;
+    # the answers themselves are on view_student_qas
+    page = InterviewPage.from_request(Interview.query.filter_by(hr_id=hr.id), request.args)
+    interview_ids = [interview.id for interview in page]
+    attempts = db.session.query(InterviewAttempt, Student) \
+        .join(Student, Student.id == InterviewAttempt.student_id) \
+        .filter(InterviewAttempt.interview_id.in_(interview_ids)) \
+        .order_by(InterviewAttempt.interview_id.desc(), InterviewAttempt.started_at)
+
+    # Rows are read while the page streams out
+    student_interviews = ({
+        'interview_id': attempt.interview_id,
+        'student_id': attempt.student_id,
+        'student_name': student.name,
+        'student_email': student.email,
+        'student_phone': student.phone,
+        'total_questions': attempt.question_count,
+        'answered': attempt.answered_count,
+        'avg_score': round(attempt.avg_score, 2) if attempt.avg_score is not None else '—',
+        'completed_at': attempt.completed_at,
+    } for attempt, student in attempts.yield_per(HR_EXPORT_CHUNK))
+
+    return stream_page(
         'hr/hr_analytics.html',
         total_interviews=total_interviews,
         completed_interviews=completed_interviews,
         pending_interviews=pending_interviews,
         unique_hrs=unique_hrs,
-        student_interviews=student_interviews
+        student_interviews=student_interviews,
+        page=page
     )
 
 
@@ -365,19 +634,13 @@ def score_graph():
     # Get or create HR record
     hr = get_or_create_hr(current_user)
 
-    # Fetch scores from this HR's interviews
-    interviews = Interview.query.filter_by(hr_id=hr.id).all()
-
-    # Collect all scores
-    all_scores = []
-    for interview in interviews:
-        for qa in interview.qa_pairs:
-            if qa.score is not None:
-                all_scores.append(qa.score)
-
-    # Count frequency of each score (0–10 range)
-    from collections import Counter
-    score_counts = Counter(all_scores)
+    # Count frequency of each score of this HR's interviews in the database
+    score_counts = dict(
+        db.session.query(QuestionAnswer.score, func.count())
+        .join(Interview, Interview.id == QuestionAnswer.interview_id)
+        .filter(Interview.hr_id == hr.id, QuestionAnswer.score.isnot(None))
+        .group_by(QuestionAnswer.score).all()
+    )
 
     # Prepare data: for scores 0–10
     labels = list(range(0, 11))
@@ -399,68 +662,85 @@ def hr_export():
     import csv
     from io import StringIO
 
-    si = StringIO()
-    cw = csv.writer(si)
-
-    # CSV headers
-    cw.writerow([
-        'Interview ID',
-        'Company Name',
-        'Job Title',
-        'Student Name',
-        'Student Email',
-        'Student Phone',
-        'No. of Questions',
-        'Question',
-        'Candidate Answer',
-        'LLM Answer',
-        'Score'
-    ])
-
     # Get or create HR record
     hr = get_or_create_hr(current_user)
+    interviews = Interview.query.filter_by(hr_id=hr.id)
 
-    # Fetch Interviews for this HR
-    interviews = Interview.query.filter_by(hr_id=hr.id).all()
-
-    if not interviews:
+    if not interviews.first():
         flash("No interviews found for export.", "info")
         return redirect(url_for('hr.hr_analytics'))
 
-    for interview in interviews:
-        company_name = interview.company_name or 'N/A'
-        job_title = interview.job_title or 'N/A'
-
-        # Find unique students in this interview
-        student_ids = {qa.student_id for qa in interview.qa_pairs if qa.student_id}
-
-        for student_id in student_ids:
-            student = Student.query.get(student_id)
-            if not student:
-                continue
-
-            # Total no. of questions answered by this student in this interview
-            student_qas = [qa for qa in interview.qa_pairs if qa.student_id == student_id]
-            num_questions = len(student_qas)
-
-            for qa in student_qas:
-                cw.writerow([
-                    interview.id,
-                    company_name,
-                    job_title,
-                    student.name,
-                    student.email,
-                    student.phone or '',
-                    num_questions,
-                    qa.text,
-                    qa.answer_text or '',
-                    qa.llm_answer_text or '',
-                    qa.score if qa.score is not None else ''
-                ])
-
-    output = si.getvalue()
-
-    return (output, 200, {
+    def generate():
+        si = StringIO()
+        cw = csv.writer(si)
+
+        def flush():
+            data = si.getvalue()
+            si.seek(0)
+            si.truncate(0)
+            return data
+
+        # CSV headers
+        cw.writerow([
+            'Interview ID',
+            'Company Name',
+            'Job Title',
+            'Student Name',
+            'Student Email',
+            'Student Phone',
+            'No. of Questions',
+            'Question',
+            'Candidate Answer',
+            'LLM Answer',
+            'Score'
+        ])
+        yield flush()
+
+        # A chunk of interviews at a time, each with its answers in one query, so
+        # memory stays flat however many interviews the HR has
+        after = None
+        while True:
+            page = InterviewPage(interviews, after=after, page_size=HR_EXPORT_CHUNK)
+            chunk = list(page)
+            rows = db.session.query(QuestionAnswer, Student) \
+                .join(Student, Student.id == QuestionAnswer.student_id) \
+                .filter(QuestionAnswer.interview_id.in_([interview.id for interview in chunk])) \
+                .order_by(QuestionAnswer.interview_id, QuestionAnswer.student_id, QuestionAnswer.id).all()
+
+            candidates = {}
+            for qa, student in rows:
+                candidates.setdefault(qa.interview_id, {}).setdefault(student.id, (student, []))[1].append(qa)
+
+            for interview in chunk:
+                company_name = interview.company_name or 'N/A'
+                job_title = interview.job_title or 'N/A'
+
+                for student, student_qas in candidates.get(interview.id, {}).values():
+                    # Total no. of questions answered by this student in this interview
+                    num_questions = len(student_qas)
+
+                    for qa in student_qas:
+                        cw.writerow([
+                            interview.id,
+                            company_name,
+                            job_title,
+                            student.name,
+                            student.email,
+                            student.phone or '',
+                            num_questions,
+                            qa.text,
+                            qa.answer_text or '',
+                            qa.llm_answer_text or '',
+                            qa.score if qa.score is not None else ''
+                        ])
+            yield flush()
+
+            db.session.expunge_all()
+            if not page.next_cursor:
+                return
+            after = page.next_cursor
+
+    return Response(stream_with_context(generate()), 200, {
         'Content-Type': 'text/csv',
         'Content-Disposition': 'attachment; filename="interview_export.csv"'
     })
@@ -481,19 +761,44 @@ def hr_summary():
         flash("HR profile not found.", "warning")
         return render_template('hr/hr_summary.html', interviews=[])
 
-    # Fetch interviews with eager loading
-    interviews = Interview.query.options(
+    # One page of interviews; their Q&A is fetched from interview_qas when a row is expanded
+    interviews = InterviewPage.from_request(Interview.query.options(
         joinedload(Interview.student),
-        joinedload(Interview.qa_pairs)
-    ).filter_by(hr_id=hr.id).order_by(Interview.created_at.desc()).all()
-
-    return render_template('hr/hr_summary.html', 
-        interviews=[{
-            'interview': interview,
-            'q_and_a': interview.qa_pairs,
-            'student': interview.student
-        } for interview in interviews]
-    )
+        joinedload(Interview.hr)
+    ).filter_by(hr_id=hr.id), request.args)
+
+    return stream_page('hr/hr_summary.html', interviews=interviews)
+
+
+# Q&A of one interview, loaded lazily by the HR pages
+@hr_bp.route('/hr/interview_qas/<int:interview_id>')
+@login_required
+def interview_qas(interview_id):
+    if not current_user.is_hr():
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    interview = Interview.query.get_or_404(interview_id)
+    if not interview.hr or interview.hr.email != current_user.email:
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    query = db.session.query(QuestionAnswer, Student) \
+        .outerjoin(Student, Student.id == QuestionAnswer.student_id) \
+        .filter(QuestionAnswer.interview_id == interview.id)
+    student_id = request.args.get('student_id', type=int)
+    if student_id:
+        query = query.filter(QuestionAnswer.student_id == student_id)
+
+    return jsonify({
+        'interview_id': interview.id,
+        'qa_pairs': [{
+            'id': qa.id,
+            'question': qa.text,
+            'answer': qa.answer_text,
+            'llm_answer': qa.llm_answer_text,
+            'score': qa.score,
+            'student': {'id': student.id, 'name': student.name, 'email': student.email} if student else None
+        } for qa, student in query.order_by(QuestionAnswer.student_id, QuestionAnswer.id)]
+    })
 
 
 
@@ -514,10 +819,10 @@ def hr_links():
     # Get or create HR record
     hr = get_or_create_hr(current_user)
 
-    # Now fetch interviews associated with this HR
-    interviews = Interview.query.filter_by(hr_id=hr.id).all()
+    # One page of this HR's interviews; rows are sent as they are fetched
+    interviews = InterviewPage.from_request(Interview.query.filter_by(hr_id=hr.id), request.args)
 
-    return render_template('hr/hr_link.html', interviews=interviews)
+    return stream_page('hr/hr_link.html', interviews=interviews)
 
 
 
@@ -533,13 +838,16 @@ def edit_interview(id):
     if request.method == 'POST':
         interview.level = request.form.get('level')
         interview.type = request.form.get('interview_type')
-        interview.num_questions = request.form.get('num_questions')
+        interview.num_questions = request.form.get('num_questions', type=int)
         interview.custom_questions = request.form.get('custom_questions')
         interview.job_title = request.form.get('job_title')
         interview.company_name = request.form.get('company_name')
         interview.job_desc = request.form.get('job_desc')
         db.session.commit()
 
+        # Rebuilds only if the job description changed or the pool is too small
+        schedule_question_pool(interview)
+
         flash("Interview updated successfully!", "success")
         return redirect(url_for('hr.hr_links'))
 
@@ -560,22 +868,74 @@ def delete_interview(id):
     return redirect(url_for('hr.hr_links'))
 
 
-def evaluate_all_answers(interview_id, student_id):
+def store_answer_evaluation(app, qa_id, answer_text, on_evaluated=None):
+    """Callback that saves a background evaluation, unless the answer changed meanwhile."""
+    def store(result):
+        with app.app_context():
+            qa = db.session.get(QuestionAnswer, qa_id)
+            if qa and qa.answer_text == answer_text:
+                qa.llm_answer_text, qa.score = result
+                refresh_attempt(qa.interview_id, qa.student_id)
+                db.session.commit()
+                if on_evaluated:
+                    on_evaluated(evaluation_progress(qa.interview_id, qa.student_id))
+            db.session.remove()
+    return store
+
+
+def unscored_answers(interview_id, student_id):
+    """id -> QuestionAnswer of a candidate's answers without a score; a new read transaction, so polls see new scores."""
+    db.session.commit()
+    return {
+        qa.id: qa for qa in QuestionAnswer.query.filter_by(interview_id=interview_id, student_id=student_id)
+        if qa.answer_text and (qa.llm_answer_text is None or qa.score is None)
+    }
+
+
+def evaluate_all_answers(interview_id, student_id, score_wait=0):
+    """
+    Score a candidate's answers that have no score yet. Answers were sent for
+    scoring as they came in, by whichever process took them, and each score is
+    stored on its row; up to `score_wait` seconds are given to the ones still
+    being scored before the rest are evaluated here.
+    """
     print(f"Evaluating answers for interview {interview_id} and student {student_id}")
-    interview = Interview.query.get(interview_id)
-    if not interview:
+    if db.session.get(Interview, interview_id) is None:
         return "Interview not found"
 
-    for qa in interview.qa_pairs:
-        if qa.student_id != student_id:
-            continue
-
-        if qa.answer_text and (qa.llm_answer_text is None or qa.score is None):
-            ideal_answer, score = evaluate_answer(qa.text, qa.answer_text)
-            qa.llm_answer_text = ideal_answer
-            qa.score = score
-            db.session.commit()  # Can be optimized with bulk commit later
+    deadline = time.monotonic() + score_wait
+    pending = unscored_answers(interview_id, student_id)
+    while pending and time.monotonic() < deadline:
+        time.sleep(EVAL_POLL_INTERVAL)
+        pending = unscored_answers(interview_id, student_id)
+
+    if not pending:
+        return "Evaluation completed"
+
+    # Ideal answers other candidates of this interview already got for the same
+    # questions help the prescorer; the most recent one wins
+    texts = {qa.text for qa in pending.values()}
+    ideal_answers = {}
+    for q_text, ideal_answer in (
+        db.session.query(QuestionAnswer.text, QuestionAnswer.llm_answer_text)
+        .filter(QuestionAnswer.interview_id == interview_id, QuestionAnswer.text.in_(texts),
+                QuestionAnswer.score > 0, QuestionAnswer.llm_answer_text.isnot(None))
+        .order_by(QuestionAnswer.id.desc())
+    ):
+        ideal_answers.setdefault(q_text, ideal_answer)
+
+    # Fan the LLM calls out over the shared pool, then write back in one transaction
+    results = evaluate_pairs([(qa.id, qa.text, qa.answer_text) for qa in pending.values()],
+                             ideal_answers=ideal_answers)
+    for qa_id, (ideal_answer, score) in results.items():
+        qa = pending[qa_id]
+        qa.llm_answer_text = ideal_answer
+        qa.score = score
+    refresh_attempt(interview_id, student_id)
+    db.session.commit()
 
+    if len(results) < len(pending):
+        print(f"{len(pending) - len(results)} answer(s) left pending for interview {interview_id}")
     return "Evaluation completed"
 
 
@@ -608,12 +968,18 @@ def evaluate_answer_api():
         }), 200
 
     # Else — run evaluation via LLM
-    ideal_answer, score = evaluate_answer(qa.text, candidate_answer)
+    try:
+        ideal_answer, score = evaluate_answer(qa.text, candidate_answer)
+    except LLMUnavailableError as e:
+        print(f"evaluate_answer_api: {e}")
+        return jsonify({'error': 'Evaluation service is temporarily unavailable. Please try again later.'}), 503
 
     # Update DB record
     qa.answer_text = candidate_answer
     qa.llm_answer_text = ideal_answer
     qa.score = score
+    if qa.student_id:
+        refresh_attempt(qa.interview_id, qa.student_id)
     db.session.commit()
 
     return jsonify({
@@ -622,6 +988,23 @@ def evaluate_answer_api():
     }), 200
 
 
+# LLM call metrics, cache, resilience and prompt-size statistics for operators
+@hr_bp.route('/hr/llm_stats')
+@login_required
+def llm_stats():
+    if not current_user.is_hr():
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    return jsonify({
+        'calls': llm_metrics.snapshot(),
+        'cache': llm_cache.stats(),
+        'resilience': llm_resilience_stats(),
+        'resume_prompts': resume_stats(),
+        'prescorer': prescore_stats(),
+        'interview_state': state_stats()
+    })
+
+
 @hr_bp.route('/hr/view_interview_details')
 @login_required
 def view_interview_details():
@@ -631,11 +1014,17 @@ def view_interview_details():
     # Get or create HR record
     hr = get_or_create_hr(current_user)
 
-    interviews = Interview.query.filter_by(hr_id=hr.id).all()
+    page = InterviewPage.from_request(Interview.query.filter_by(hr_id=hr.id), request.args)
+    interviews = list(page)
+    student_counts = dict(
+        db.session.query(InterviewAttempt.interview_id, func.count())
+        .filter(InterviewAttempt.interview_id.in_([interview.id for interview in interviews]))
+        .group_by(InterviewAttempt.interview_id).all()
+    )
 
     interview_data = []
     for interview in interviews:
-        student_count = len({qa.student_id for qa in interview.qa_pairs if qa.student_id})
+        student_count = student_counts.get(interview.id, 0)
         interview_data.append({
             'id': interview.id,
             'company': interview.company_name or 'N/A',
@@ -644,7 +1033,7 @@ def view_interview_details():
             'student_count': student_count
         })
 
-    return render_template('hr/view_interview_details.html', interviews=interview_data)
+    return stream_page('hr/view_interview_details.html', interviews=interview_data, page=page)
 
 
 @hr_bp.route('/hr/view_interview_students/<int:interview_id>')
@@ -685,22 +1074,23 @@ def view_interview_student_summary(interview_id):
     if interview.hr.email != current_user.email:
         abort(403)
 
-    students = Student.query.join(QuestionAnswer).filter(
-        QuestionAnswer.interview_id == interview.id
-    ).distinct().all()
+    attempts = db.session.query(InterviewAttempt, Student) \
+        .join(Student, Student.id == InterviewAttempt.student_id) \
+        .filter(InterviewAttempt.interview_id == interview.id) \
+        .order_by(InterviewAttempt.started_at).all()
 
     student_data = []
-    for student in students:
-        qa_pairs = QuestionAnswer.query.filter_by(interview_id=interview.id, student_id=student.id).all()
-        scores = [qa.score for qa in qa_pairs if qa.score is not None]
-        avg_score = round(sum(scores) / len(scores), 2) if scores else 'N/A'
+    for attempt, student in attempts:
         student_data.append({
             'id': student.id,
             'name': student.name,
             'email': student.email,
             'phone': student.phone,
-            'total_questions': len(qa_pairs),
-            'avg_score': avg_score
+            'total_questions': attempt.question_count,
+            'answered': attempt.answered_count,
+            'avg_score': round(attempt.avg_score, 2) if attempt.avg_score is not None else 'N/A',
+            'completed': attempt.completed_at.strftime('%d-%m-%Y %H:%M') if attempt.completed_at
+            else ('In progress' if attempt.answered_count < attempt.question_count else '—')
         })
 
     return render_template('hr/view_students_of_interview_summary.html',
@@ -0,0 +1,65 @@
+import datetime
+
+import sqlalchemy as sa
+
+from extensions import db
+from models import InterviewAttempt, QuestionAnswer
+
+
+def _aggregates(*where):
+    """Counts and average over QuestionAnswer rows, as SQL expressions."""
+    qa = QuestionAnswer
+    columns = {
+        'question_count': sa.func.count(qa.id),
+        'answered_count': sa.func.count(sa.case((qa.answer_text != '', 1))),
+        'evaluated_count': sa.func.count(qa.score),
+        'avg_score': sa.func.avg(qa.score),
+    }
+    if not where:
+        return columns
+    return {name: sa.select(column).where(*where).scalar_subquery() for name, column in columns.items()}
+
+
+def refresh_attempt(interview_id, student_id, completed=False):
+    """
+    Bring a candidate's InterviewAttempt row up to date after its questions,
+    answers or scores changed. The aggregates are computed by the database in
+    the same statement (over that candidate's rows only, through the
+    (interview_id, student_id) index), so concurrent answer and evaluation
+    writes can't leave stale counts behind. Caller commits.
+    """
+    db.session.flush()  # the aggregates must see the caller's pending changes
+    now = datetime.datetime.utcnow()
+    values = _aggregates(QuestionAnswer.interview_id == interview_id, QuestionAnswer.student_id == student_id)
+    values['updated_at'] = now
+    if completed:
+        values['completed_at'] = sa.func.coalesce(InterviewAttempt.completed_at, now)
+
+    updated = InterviewAttempt.query.filter_by(interview_id=interview_id, student_id=student_id) \
+        .update(values, synchronize_session=False)
+    if not updated:
+        if completed:
+            values['completed_at'] = now
+        db.session.execute(sa.insert(InterviewAttempt).values(
+            interview_id=interview_id, student_id=student_id, started_at=now, **values))
+
+
+def rebuild_attempts():
+    """
+    Recompute every attempt from the QuestionAnswer table, e.g. for a database
+    that predates it. Existing rows keep their start and completion times.
+    """
+    qa, attempt = QuestionAnswer, InterviewAttempt
+    now = datetime.datetime.utcnow()
+    db.session.execute(sa.update(attempt).values(
+        updated_at=now, **_aggregates(qa.interview_id == attempt.interview_id, qa.student_id == attempt.student_id)))
+
+    aggregates = _aggregates()
+    missing = sa.select(qa.interview_id, qa.student_id, *aggregates.values(), sa.literal(now)) \
+        .where(qa.interview_id.isnot(None), qa.student_id.isnot(None),
+               ~sa.exists().where(attempt.interview_id == qa.interview_id, attempt.student_id == qa.student_id)) \
+        .group_by(qa.interview_id, qa.student_id)
+    result = db.session.execute(sa.insert(attempt).from_select(
+        ['interview_id', 'student_id', *aggregates, 'updated_at'], missing))
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,170 @@
+import os
+import json
+import uuid
+import datetime
+import threading
+from collections import OrderedDict
+
+from flask import session
+
+from extensions import db
+from models import InterviewSession
+
+
+# Seconds an interview's state is kept after its last request
+INTERVIEW_STATE_TTL = int(os.getenv("INTERVIEW_STATE_TTL", 6 * 3600))
+# Interview states kept in this process's memory tier
+INTERVIEW_STATE_MEMORY_ENTRIES = int(os.getenv("INTERVIEW_STATE_MEMORY_ENTRIES", 2048))
+
+# How many new states between two purges of expired rows
+_PURGE_EVERY = 100
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+_created = 0
+_stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'writes': 0}
+
+
+def _cookie_key(kind):
+    return f'{kind}_interview_state'
+
+
+def _expiry():
+    return datetime.datetime.utcnow() + datetime.timedelta(seconds=INTERVIEW_STATE_TTL)
+
+
+def _remember(state_id, data, expires_at, updated_at):
+    # The JSON text is kept, so every caller gets its own copy of the state
+    with _lock:
+        _memory[state_id] = (data, expires_at, updated_at)
+        _memory.move_to_end(state_id)
+        while len(_memory) > INTERVIEW_STATE_MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def create_state(kind, data):
+    """
+    Store the state of a new `kind` ('student' or 'hr') interview server-side and
+    put only its opaque id in the cookie session.
+    """
+    global _created
+    state_id = uuid.uuid4().hex
+    expires_at = _expiry()
+    updated_at = datetime.datetime.utcnow()
+    text = json.dumps(data)
+    db.session.add(InterviewSession(id=state_id, kind=kind, data=text,
+                                    expires_at=expires_at, updated_at=updated_at))
+    db.session.commit()
+    _remember(state_id, text, expires_at, updated_at)
+    session[_cookie_key(kind)] = state_id
+
+    _created += 1
+    if _created % _PURGE_EVERY == 0:
+        purge_expired()
+    return data
+
+
+def get_state(kind):
+    """
+    The current user's `kind` interview state, or None if there is none (or it
+    expired). The memory tier only saves reading and parsing the data column:
+    its entry is used while the row's updated_at still matches, so a save made
+    by another process is never missed.
+    """
+    state_id = session.get(_cookie_key(kind))
+    if not state_id:
+        return None
+    now = datetime.datetime.utcnow()
+    row = db.session.query(InterviewSession.kind, InterviewSession.expires_at, InterviewSession.updated_at) \
+        .filter_by(id=state_id).first()
+    if row is None or row.kind != kind or row.expires_at <= now:
+        with _lock:
+            _memory.pop(state_id, None)
+            _stats['misses'] += 1
+        return None
+
+    with _lock:
+        entry = _memory.get(state_id)
+        if entry and entry[2] == row.updated_at:
+            _memory.move_to_end(state_id)
+            _stats['memory_hits'] += 1
+            return json.loads(entry[0])
+
+    text = db.session.query(InterviewSession.data).filter_by(id=state_id).scalar()
+    if text is None:
+        with _lock:
+            _stats['misses'] += 1
+        return None
+    with _lock:
+        _stats['db_hits'] += 1
+    _remember(state_id, text, row.expires_at, row.updated_at)
+    return json.loads(text)
+
+
+def save_state(kind, state):
+    """Write the (modified) state back; each save also extends its expiry."""
+    state_id = session.get(_cookie_key(kind))
+    if not state_id:
+        return
+    expires_at = _expiry()
+    updated_at = datetime.datetime.utcnow()
+    text = json.dumps(state)
+    InterviewSession.query.filter_by(id=state_id).update({
+        'data': text,
+        'expires_at': expires_at,
+        'updated_at': updated_at,
+    }, synchronize_session=False)
+    db.session.commit()
+    _remember(state_id, text, expires_at, updated_at)
+    with _lock:
+        _stats['writes'] += 1
+
+
+def current_state_id(kind):
+    return session.get(_cookie_key(kind))
+
+
+def store_questions(state_id, questions):
+    """
+    Save the questions streamed in so far on the state row. They have their own
+    column, so saves of the state data can't overwrite them. Caller needs an app context.
+    """
+    InterviewSession.query.filter_by(id=state_id).update({'questions': json.dumps(questions)},
+                                                         synchronize_session=False)
+    db.session.commit()
+
+
+def load_questions(kind):
+    """The streamed questions stored on the current user's `kind` state row, as saved by any process."""
+    state_id = session.get(_cookie_key(kind))
+    if not state_id:
+        return []
+    db.session.commit()  # a new read transaction, so repeated polls see new questions
+    text = db.session.query(InterviewSession.questions).filter_by(id=state_id).scalar()
+    return json.loads(text) if text else []
+
+
+def clear_state(kind):
+    state_id = session.pop(_cookie_key(kind), None)
+    if not state_id:
+        return
+    with _lock:
+        _memory.pop(state_id, None)
+    InterviewSession.query.filter_by(id=state_id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def purge_expired():
+    now = datetime.datetime.utcnow()
+    with _lock:
+        for state_id in [sid for sid, (_, expires_at, _) in _memory.items() if expires_at <= now]:
+            del _memory[state_id]
+    InterviewSession.query.filter(InterviewSession.expires_at <= now).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def state_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats['memory_entries'] = len(_memory)
+    return stats
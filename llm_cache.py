@@ -0,0 +1,171 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+# Seconds a cached response stays valid
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+# Entries kept in the in-process LRU tier
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", 1024))
+# Entries kept in the SQLite tier before the least recently used are evicted
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50000))
+
+# How many writes between two size checks of the SQLite tier
+_PURGE_EVERY = 100
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so formatting differences don't produce new keys."""
+    return re.sub(r'\s+', ' ', prompt or '').strip()
+
+
+def make_key(model_name, prompt):
+    return hashlib.sha256(f"{model_name}\n{normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Two-tier (in-process LRU + SQLite) cache for LLM results."""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL,
+                 memory_entries=LLM_CACHE_MEMORY_ENTRIES, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+        self.counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+            'saved_seconds': 0.0,
+        }
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " latency REAL NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " last_used_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, value, latency, expires_at):
+        self._memory[key] = (value, latency, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[2] > now:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                self.counters['saved_seconds'] += entry[1]
+                return entry[0]
+            self._memory.pop(key, None)
+
+            try:
+                conn = self._db()
+                row = conn.execute(
+                    "SELECT value, latency, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[2] + self.ttl > now:
+                    conn.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1], row[2] + self.ttl)
+                    self.counters['disk_hits'] += 1
+                    self.counters['saved_seconds'] += row[1]
+                    return value
+                if row:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    self.counters['evictions'] += 1
+            except sqlite3.Error as e:
+                print(f"LLM cache read error: {e}")
+
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key, value, latency=0.0):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, latency, now + self.ttl)
+            self.counters['writes'] += 1
+            try:
+                conn = self._db()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, latency, created_at, last_used_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(value), latency, now, now)
+                )
+                conn.commit()
+                self._writes += 1
+                if self._writes % _PURGE_EVERY == 0:
+                    self._purge(conn, now)
+            except sqlite3.Error as e:
+                print(f"LLM cache write error: {e}")
+
+    def _purge(self, conn, now):
+        """Drop expired rows, then the least recently used ones above max_entries."""
+        expired = conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        overflow = conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        conn.commit()
+        self.counters['evictions'] += expired + overflow
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['saved_seconds'] = round(stats['saved_seconds'], 2)
+        return stats
+
+
+cache = LLMCache()
+
+
+def get_or_compute(model_name, prompt, compute):
+    """
+    Return the cached result for (model_name, prompt), or call `compute()` and
+    cache what it returns. Exceptions from `compute` propagate and nothing is
+    cached, so fallbacks and error placeholders never get stored.
+    """
+    key = make_key(model_name, prompt)
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    started = time.monotonic()
+    value = compute()
+    cache.set(key, value, time.monotonic() - started)
+    return value
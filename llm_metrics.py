@@ -0,0 +1,102 @@
+import threading
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, float('inf')]
+
+_lock = threading.Lock()
+_series = {}
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if bound == float('inf') else bound
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, 4) if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'max': round(self.max, 4),
+            'buckets': [{'le': '+Inf' if b == float('inf') else b, 'count': c} for b, c in zip(self.buckets, self.counts)],
+        }
+
+
+class CallSeries:
+    """Aggregates for one (operation, model, endpoint) label set."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.parse_failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def snapshot(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.calls, 4) if self.calls else 0.0,
+            'parse_failures': self.parse_failures,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'latency_seconds': self.latency.snapshot(),
+        }
+
+
+def _get(operation, model, endpoint):
+    key = (operation, model, endpoint)
+    if key not in _series:
+        _series[key] = CallSeries()
+    return _series[key]
+
+
+def record_call(operation, model, endpoint, latency, prompt_tokens=0, completion_tokens=0, error=False):
+    with _lock:
+        series = _get(operation, model, endpoint)
+        series.calls += 1
+        series.errors += int(error)
+        series.prompt_tokens += prompt_tokens or 0
+        series.completion_tokens += completion_tokens or 0
+        series.latency.observe(latency)
+
+
+def record_parse_failure(operation, model, endpoint, count=1):
+    with _lock:
+        _get(operation, model, endpoint).parse_failures += count
+
+
+def snapshot():
+    with _lock:
+        return [
+            {'operation': operation, 'model': model, 'endpoint': endpoint, **series.snapshot()}
+            for (operation, model, endpoint), series in sorted(_series.items())
+        ]
@@ -1,45 +1,124 @@
 import os
-import google.generativeai as genai
+import re
 from dotenv import load_dotenv
-from openai import OpenAI
-from flask import jsonify
 import json
+import time
+from llm_cache import cache, make_key, get_or_compute
+from llm_providers import get_provider, estimate_tokens
+import llm_metrics
+from llm_resilience import call_with_resilience, stream_with_resilience, LLMUnavailableError
 
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel(model_name="gemini-1.5-flash", generation_config={"temperature": 0.7})
+
+# Soft cap on the size of a single batch evaluation prompt (characters)
+BATCH_PROMPT_MAX_CHARS = int(os.getenv("LLM_BATCH_MAX_CHARS", 12000))
+
+
+class LLMParseError(ValueError):
+    """Raised when a model response can't be parsed into the expected shape."""
+
+
+def complete(prompt, json_mode=False, timeout=None, operation='complete'):
+    """
+    Uncached call to the configured LLM backend, with retries and the circuit
+    breaker. Latency, token usage and errors are recorded under `operation`.
+    """
+    provider = get_provider()
+    started = time.monotonic()
+    try:
+        result = call_with_resilience(
+            lambda remaining: provider.generate(prompt, json_mode=json_mode, timeout=remaining),
+            deadline=timeout
+        )
+    except Exception:
+        llm_metrics.record_call(operation, provider.model_name, provider.endpoint,
+                                time.monotonic() - started, estimate_tokens(prompt), 0, error=True)
+        raise
+    llm_metrics.record_call(operation, provider.model_name, provider.endpoint, time.monotonic() - started,
+                            result.prompt_tokens, result.completion_tokens)
+    return result.text
+
+
+def record_parse_failure(operation, count=1):
+    provider = get_provider()
+    llm_metrics.record_parse_failure(operation, provider.model_name, provider.endpoint, count)
+
+
+def generate_text(prompt, operation='generate_text'):
+    """Cached free-form generation; identical prompts reuse the stored response."""
+    return get_or_compute(get_provider().label, prompt, lambda: complete(prompt, operation=operation))
+
+
+NUMBERED_LINE = re.compile(r'^\s*\d+[.)]\s*(.+)$')
+
+
+def stream_questions(prompt, timeout=None, operation='stream_questions'):
+    """
+    Stream a numbered-list response and yield each question as soon as its line
+    is complete, instead of waiting for the whole list.
+    """
+    buffer = ''
+    received = ''
+    provider = get_provider()
+    started = time.monotonic()
+    error = True
+    try:
+        chunks = stream_with_resilience(lambda remaining: provider.stream(prompt, timeout=remaining), deadline=timeout)
+        for chunk in chunks:
+            received += chunk
+            buffer += chunk
+            *lines, buffer = buffer.split('\n')
+            for line in lines:
+                match = NUMBERED_LINE.match(line)
+                if match:
+                    yield match.group(1).strip()
+        match = NUMBERED_LINE.match(buffer)
+        if match:
+            yield match.group(1).strip()
+        error = False
+    finally:
+        # Streaming APIs don't report usage per chunk, so tokens are estimated
+        llm_metrics.record_call(operation, provider.model_name, provider.endpoint, time.monotonic() - started,
+                                estimate_tokens(prompt), estimate_tokens(received), error=error)
 
 
 def generate_questions(prompt, num_questions=5):
     try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(
+        full_prompt = (
             f"{prompt}. Return exactly {num_questions} questions in JSON format: "
             "{'questions': ['q1', 'q2', ...]}"
         )
-        
-        # Extract JSON from response
-        try:
-            start = response.text.find('{')
-            end = response.text.rfind('}') + 1
-            json_str = response.text[start:end]
-            data = json.loads(json_str)
-            return data.get('questions', [])[:num_questions]
-        except:
-            # Fallback if JSON parsing fails
-            questions = [line.strip() for line in response.text.split('\n') 
-                        if line.strip() and len(line) > 10][:num_questions]
-            return questions
+
+        def compute():
+            text = complete(full_prompt, operation='generate_questions')
+
+            # Extract JSON from response
+            try:
+                start = text.find('{')
+                end = text.rfind('}') + 1
+                json_str = text[start:end]
+                data = json.loads(json_str)
+                return data.get('questions', [])[:num_questions]
+            except:
+                # Fallback if JSON parsing fails
+                record_parse_failure('generate_questions')
+                questions = [line.strip() for line in text.split('\n') 
+                            if line.strip() and len(line) > 10][:num_questions]
+                return questions
+
+        return get_or_compute(get_provider().label, full_prompt, compute)
             
+    except LLMUnavailableError:
+        # Placeholder questions would look like a real interview; let the caller handle it
+        raise
     except Exception as e:
         print(f"Error generating questions: {str(e)}")
         return [f"Technical question {i+1}" for i in range(num_questions)]
 
-def evaluate_answer(question, answer):
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        prompt = f"""
+
+def _evaluation_prompt(question, answer):
+    return f"""
         Evaluate this interview answer and provide:
         1. An ideal answer (2-3 sentences)
         2. A score (0-100)
@@ -53,21 +132,148 @@ def evaluate_answer(question, answer):
         Question: {question}
         Answer: {answer}
         """
-        
-        response = model.generate_content(prompt)
-        
-        # Extract JSON from response
-        try:
-            start = response.text.find('{')
-            end = response.text.rfind('}') + 1
-            json_str = response.text[start:end]
-            data = json.loads(json_str)
-            return data.get('ideal_answer', ''), data.get('score', 0)
-        except:
-            return "Evaluation not available", 0
-            
+
+
+def evaluate_answer(question, answer, timeout=None):
+    try:
+        prompt = _evaluation_prompt(question, answer)
+
+        def compute():
+            text = complete(prompt, timeout=timeout, operation='evaluate_answer')
+
+            # Extract JSON from response
+            try:
+                start = text.find('{')
+                end = text.rfind('}') + 1
+                json_str = text[start:end]
+                data = json.loads(json_str)
+                return data.get('ideal_answer', ''), data.get('score', 0)
+            except Exception as e:
+                record_parse_failure('evaluate_answer')
+                raise LLMParseError(str(e))
+
+        ideal_answer, score = get_or_compute(get_provider().label, prompt, compute)
+        return ideal_answer, score
+
+    except LLMParseError:
+        return "Evaluation not available", 0
+    except LLMUnavailableError:
+        # Don't record a fake score; let the caller keep the answer pending
+        raise
     except Exception as e:
         print(f"Error evaluating answer: {str(e)}")
         return "Evaluation error", 0
-    
 
+
+BATCH_PROMPT_HEADER = """
+Evaluate each of the following interview answers. For every item provide:
+1. An ideal answer (2-3 sentences)
+2. A score (0-100)
+
+Return only a JSON array with one object per item, in any order:
+[
+    {"index": 1, "ideal_answer": "...", "score": 85}
+]
+"""
+
+
+def _format_batch_item(index, question, answer):
+    return f"\n[{index}]\nQuestion: {question}\nAnswer: {answer}\n"
+
+
+def chunk_pairs(pairs, max_chars=BATCH_PROMPT_MAX_CHARS):
+    """Split (question, answer) pairs into index chunks that keep each prompt under max_chars."""
+    chunks, current, size = [], [], len(BATCH_PROMPT_HEADER)
+    for i, (question, answer) in enumerate(pairs):
+        item_size = len(_format_batch_item(i + 1, question, answer))
+        if current and size + item_size > max_chars:
+            chunks.append(current)
+            current, size = [], len(BATCH_PROMPT_HEADER)
+        current.append(i)
+        size += item_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _parse_batch_response(text, count):
+    """Map 1-based item index -> (ideal_answer, score) for every item that parsed cleanly."""
+    start = text.find('[')
+    end = text.rfind(']') + 1
+    try:
+        items = json.loads(text[start:end])
+    except Exception:
+        return {}
+
+    parsed = {}
+    for item in items if isinstance(items, list) else []:
+        try:
+            index = int(item['index'])
+            score = float(item['score'])
+            ideal_answer = str(item.get('ideal_answer', ''))
+        except Exception:
+            continue
+        if 1 <= index <= count:
+            parsed[index] = (ideal_answer, score)
+    return parsed
+
+
+def _evaluate_chunk(pairs, timeout=None):
+    prompt = BATCH_PROMPT_HEADER + "".join(
+        _format_batch_item(i + 1, question, answer) for i, (question, answer) in enumerate(pairs)
+    )
+    text = complete(prompt, json_mode=True, timeout=timeout, operation='evaluate_batch')
+    parsed = _parse_batch_response(text, len(pairs))
+    if len(parsed) < len(pairs):
+        record_parse_failure('evaluate_batch', len(pairs) - len(parsed))
+    return parsed
+
+
+def evaluate_answers_batch(pairs, timeout=None):
+    """
+    Score a list of (question, answer) pairs with as few LLM calls as possible.
+
+    Pairs are sent in chunks of one structured-JSON request each. Items that do
+    not come back parsed are retried once as a smaller batch, and anything still
+    missing falls back to evaluate_answer. Results keep the order of `pairs`;
+    items left unscored because the LLM is unavailable come back as None.
+    """
+    # Answers already scored under the single-answer prompt are served from the cache
+    keys = [make_key(get_provider().label, _evaluation_prompt(question, answer)) for question, answer in pairs]
+    results = [cache.get(key) for key in keys]
+    results = [tuple(result) if result is not None else None for result in results]
+
+    def run(indices):
+        started = time.monotonic()
+        try:
+            parsed = _evaluate_chunk([pairs[i] for i in indices], timeout)
+        except LLMUnavailableError as e:
+            print(f"LLM unavailable, deferring answer batch: {str(e)}")
+            return
+        except Exception as e:
+            print(f"Error evaluating answer batch: {str(e)}")
+            return
+        latency = (time.monotonic() - started) / len(indices)
+        for position, i in enumerate(indices):
+            if position + 1 in parsed:
+                results[i] = parsed[position + 1]
+                cache.set(keys[i], results[i], latency)
+
+    todo = [i for i, result in enumerate(results) if result is None]
+    for chunk in chunk_pairs([pairs[i] for i in todo]):
+        run([todo[j] for j in chunk])
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if len(missing) > 1:
+        for chunk in chunk_pairs([pairs[i] for i in missing]):
+            run([missing[j] for j in chunk])
+        missing = [i for i, result in enumerate(results) if result is None]
+
+    for i in missing:
+        try:
+            results[i] = evaluate_answer(pairs[i][0], pairs[i][1], timeout)
+        except LLMUnavailableError as e:
+            print(f"LLM unavailable, deferring {len(missing)} answer(s): {str(e)}")
+            break
+
+    return results
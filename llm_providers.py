@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import namedtuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# Which backend serves LLM calls: "gemini", "openai" (any OpenAI-compatible endpoint) or "stub"
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+LLM_MODEL = os.getenv("LLM_MODEL")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", 0.7))
+# Simulated latency of the stub backend, in milliseconds
+LLM_STUB_LATENCY_MS = int(os.getenv("LLM_STUB_LATENCY_MS", 0))
+
+
+# Text of a completion plus token usage (reported by the API, or estimated)
+LLMResult = namedtuple('LLMResult', ['text', 'prompt_tokens', 'completion_tokens'])
+
+
+def estimate_tokens(text):
+    return (len(text or '') + 3) // 4
+
+
+class LLMProvider:
+    """A long-lived client for one model. Subclasses implement generate()."""
+
+    name = 'base'
+    default_model = None
+    endpoint = None
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name or self.default_model
+
+    @property
+    def label(self):
+        return f"{self.name}:{self.model_name}"
+
+    def generate(self, prompt, json_mode=False, timeout=None):
+        """Return an LLMResult with the model's response to `prompt`."""
+        raise NotImplementedError
+
+    def stream(self, prompt, timeout=None):
+        """Yield the response text in chunks as the model produces it."""
+        yield self.generate(prompt, timeout=timeout).text
+
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+    default_model = 'gemini-1.5-flash'
+    endpoint = 'generativelanguage.googleapis.com'
+
+    def __init__(self, model_name=None):
+        super().__init__(model_name)
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self.client = genai.GenerativeModel(
+            model_name=self.model_name, generation_config={"temperature": LLM_TEMPERATURE}
+        )
+
+    def generate(self, prompt, json_mode=False, timeout=None):
+        generation_config = {"response_mime_type": "application/json"} if json_mode else None
+        request_options = {"timeout": timeout} if timeout else None
+        response = self.client.generate_content(
+            prompt, generation_config=generation_config, request_options=request_options
+        )
+        usage = getattr(response, 'usage_metadata', None)
+        return LLMResult(
+            response.text,
+            getattr(usage, 'prompt_token_count', None) or estimate_tokens(prompt),
+            getattr(usage, 'candidates_token_count', None) or estimate_tokens(response.text),
+        )
+
+    def stream(self, prompt, timeout=None):
+        request_options = {"timeout": timeout} if timeout else None
+        for chunk in self.client.generate_content(prompt, stream=True, request_options=request_options):
+            yield chunk.text
+
+
+class OpenAIProvider(LLMProvider):
+    name = 'openai'
+    default_model = 'gpt-4o-mini'
+
+    def __init__(self, model_name=None):
+        super().__init__(model_name)
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL"))
+        self.endpoint = self.client.base_url.host
+
+    def generate(self, prompt, json_mode=False, timeout=None):
+        # JSON mode is left to the prompt: batch evaluation asks for a top-level array,
+        # which OpenAI's json_object response format does not allow.
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=LLM_TEMPERATURE,
+            timeout=timeout,
+        )
+        text = response.choices[0].message.content or ''
+        usage = response.usage
+        return LLMResult(
+            text,
+            usage.prompt_tokens if usage else estimate_tokens(prompt),
+            usage.completion_tokens if usage else estimate_tokens(text),
+        )
+
+    def stream(self, prompt, timeout=None):
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=LLM_TEMPERATURE,
+            timeout=timeout,
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic offline backend for load tests and benchmarks.
+
+    Recognizes the prompts this app sends (question lists, single and batch
+    evaluations) and answers them in the expected format, sleeping
+    LLM_STUB_LATENCY_MS per call to mimic a remote model.
+    """
+
+    name = 'stub'
+    default_model = 'stub-1'
+    endpoint = 'local'
+
+    def __init__(self, model_name=None, latency_ms=None):
+        super().__init__(model_name)
+        self.latency = (LLM_STUB_LATENCY_MS if latency_ms is None else latency_ms) / 1000.0
+
+    @staticmethod
+    def _score(text):
+        return int(hashlib.sha256(text.encode('utf-8')).hexdigest(), 16) % 101
+
+    def stream(self, prompt, timeout=None):
+        # Spread the latency over the lines so the first one arrives early, like a real stream
+        lines = self._respond(prompt).splitlines(keepends=True)
+        for line in lines:
+            if self.latency:
+                time.sleep(self.latency / len(lines))
+            yield line
+
+    def generate(self, prompt, json_mode=False, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+        text = self._respond(prompt)
+        return LLMResult(text, estimate_tokens(prompt), estimate_tokens(text))
+
+    def _respond(self, prompt):
+
+        if 'JSON array' in prompt:
+            items = re.findall(r'\[(\d+)\]\s*Question: (.*?)\s*Answer: (.*?)(?=\n\[\d+\]|\Z)', prompt, re.S)
+            return json.dumps([
+                {"index": int(index), "ideal_answer": f"Ideal answer to: {question.strip()}",
+                 "score": self._score(question + answer)}
+                for index, question, answer in items
+            ])
+
+        if '"ideal_answer"' in prompt:
+            question = re.search(r'Question: (.*)', prompt)
+            answer = re.search(r'Answer: (.*)', prompt)
+            question = question.group(1).strip() if question else ''
+            answer = answer.group(1).strip() if answer else ''
+            return json.dumps({"ideal_answer": f"Ideal answer to: {question}",
+                               "score": self._score(question + answer)})
+
+        count = re.search(r'exactly (\d+)', prompt)
+        count = int(count.group(1)) if count else 5
+        topic = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]
+        questions = [f"Stub question {i + 1} about topic {topic}?" for i in range(count)]
+        if "{'questions'" in prompt:
+            return json.dumps({"questions": questions})
+        return "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
+
+
+PROVIDERS = {
+    'gemini': GeminiProvider,
+    'openai': OpenAIProvider,
+    'stub': StubProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Return the process-wide provider selected by LLM_PROVIDER, creating it once."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                if LLM_PROVIDER not in PROVIDERS:
+                    raise ValueError(f"Unknown LLM_PROVIDER '{LLM_PROVIDER}'")
+                _provider = PROVIDERS[LLM_PROVIDER](LLM_MODEL)
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the active provider (e.g. a StubProvider with custom latency in a benchmark)."""
+    global _provider
+    _provider = provider
@@ -0,0 +1,183 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+
+
+# Attempts after the first one for retryable errors
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+# Base and cap of the exponential backoff, in seconds
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 8))
+# Total seconds one logical call may take, retries included
+LLM_CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", 60))
+
+# Circuit breaker: open when at least BREAKER_MIN_CALLS of the last BREAKER_WINDOW
+# calls were made and BREAKER_ERROR_RATE of them failed; probe again after BREAKER_COOLDOWN
+BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", 20))
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", 5))
+BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", 0.5))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", 30))
+
+# Rate limits, overload, timeouts and dropped connections from the Gemini and OpenAI clients
+RETRYABLE_ERRORS = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'DeadlineExceeded',
+    'InternalServerError', 'GatewayTimeout', 'Aborted',
+    'RateLimitError', 'APITimeoutError', 'APIConnectionError',
+    'TimeoutError', 'ConnectionError', 'ConnectionResetError',
+}
+
+
+class LLMUnavailableError(RuntimeError):
+    """The LLM could not be reached in time; callers should defer the work."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised without calling the LLM while the circuit breaker is open."""
+
+
+def is_retryable(exc):
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(exc).__mro__)
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 error_rate=BREAKER_ERROR_RATE, cooldown=BREAKER_COOLDOWN):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._outcomes = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                # Let exactly one probe call through
+                self._probing = True
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        print(f"[LLM] Circuit breaker opened for {self.cooldown:.0f}s")
+
+    def snapshot(self):
+        with self._lock:
+            failures = self._outcomes.count(False)
+            return {
+                'state': self.state,
+                'recent_calls': len(self._outcomes),
+                'recent_failures': failures,
+                'error_rate': round(failures / len(self._outcomes), 4) if self._outcomes else 0.0,
+            }
+
+
+breaker = CircuitBreaker()
+
+_counters = {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name, amount=1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def _backoff(attempt):
+    """Full jitter: a random delay up to the exponential cap for this attempt."""
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt)))
+
+
+def call_with_resilience(fn, deadline=None):
+    """
+    Call `fn(timeout)` with retries, backoff and the shared circuit breaker.
+
+    `timeout` is the time left before `deadline` seconds run out, so each attempt
+    can pass it on as a request timeout. Raises CircuitOpenError when the breaker
+    is open and LLMUnavailableError when retryable errors outlast the retries or
+    the deadline; other errors propagate unchanged.
+    """
+    if not breaker.allow():
+        _count('rejected')
+        raise CircuitOpenError("LLM circuit breaker is open")
+
+    _count('calls')
+    deadline = deadline or LLM_CALL_DEADLINE
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        remaining = deadline - (time.monotonic() - started)
+        try:
+            result = fn(remaining)
+        except Exception as e:
+            breaker.record(False)
+            if not is_retryable(e):
+                _count('failures')
+                raise
+            delay = _backoff(attempt)
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() - started + delay >= deadline:
+                _count('failures')
+                raise LLMUnavailableError(f"LLM call failed after {attempt + 1} attempt(s): {e}") from e
+            attempt += 1
+            _count('retries')
+            time.sleep(delay)
+            if not breaker.allow():
+                _count('rejected')
+                raise CircuitOpenError("LLM circuit breaker is open")
+            continue
+        breaker.record(True)
+        return result
+
+
+def stream_with_resilience(make_stream, deadline=None):
+    """
+    Yield from `make_stream(timeout)` under the same policy as call_with_resilience.
+    Only failures before the first chunk are retried; later ones propagate.
+    """
+    first = []
+
+    def start(timeout):
+        stream = iter(make_stream(timeout))
+        first.append(next(stream, None))
+        return stream
+
+    stream = call_with_resilience(start, deadline)
+    if first[0] is not None:
+        yield first[0]
+    yield from stream
+
+
+def stats():
+    with _counters_lock:
+        counters = dict(_counters)
+    return {'breaker': breaker.snapshot(), **counters}
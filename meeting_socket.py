@@ -0,0 +1,80 @@
+import os
+
+from flask import current_app, request, session
+from flask_login import current_user
+from flask_socketio import Namespace, emit
+
+from extensions import db, socketio
+from models import EvaluationJob
+from interview_state import get_state
+from evaluation_worker import EVAL_POLL_INTERVAL
+import hr
+import student
+
+
+MEETING_NAMESPACE = '/meeting'
+# Seconds the meeting keeps pushing evaluation progress after the last answer
+MEETING_PROGRESS_MAX_WAIT = int(os.getenv("MEETING_PROGRESS_MAX_WAIT", 1800))
+
+FLOWS = {'hr': hr, 'student': student}
+
+
+class MeetingNamespace(Namespace):
+    """
+    One persistent connection per interview meeting. The client asks for the
+    first question with `next_question`; each `answer` is saved and the next
+    `question` is pushed back right away, along with `evaluation_progress` as
+    answers get scored. The meeting pages fall back to the HTTP endpoints when
+    the socket can't connect.
+    """
+
+    def on_connect(self, auth=None):
+        flow = (auth or {}).get('flow')
+        if flow not in FLOWS:
+            return False
+        if flow == 'student' and not (current_user.is_authenticated and current_user.is_student()):
+            return False
+        if get_state(flow) is None:
+            return False
+        session['meeting_flow'] = flow
+
+    def on_next_question(self, data=None):
+        payload, _ = FLOWS[session['meeting_flow']].next_question_payload()
+        emit('question', payload)
+
+    def on_answer(self, data):
+        flow = session['meeting_flow']
+        sid = request.sid
+        state = get_state(flow) or {}
+
+        def push_progress(progress):
+            socketio.emit('evaluation_progress', progress, namespace=MEETING_NAMESPACE, to=sid)
+
+        payload, status = FLOWS[flow].record_answer(data.get('index', 0), data.get('answer', ''),
+                                                    on_evaluated=push_progress)
+        emit('answer_saved', payload)
+        if status != 200:
+            return
+
+        if payload.get('evaluation_status_url'):
+            # Last HR answer: follow the queued evaluation job until it finishes
+            socketio.start_background_task(_watch_evaluation, current_app._get_current_object(), sid,
+                                           state['interview_id'], state['student_id'])
+        payload, _ = FLOWS[flow].next_question_payload()
+        emit('question', payload)
+
+
+def _watch_evaluation(app, sid, interview_id, student_id):
+    last = None
+    waited = 0
+    while waited < MEETING_PROGRESS_MAX_WAIT:
+        with app.app_context():
+            progress = hr.evaluation_progress(interview_id, student_id)
+            db.session.remove()
+        if progress != last:
+            socketio.emit('evaluation_progress', progress, namespace=MEETING_NAMESPACE, to=sid)
+            last = progress
+        if progress['status'] in (EvaluationJob.DONE, EvaluationJob.FAILED):
+            return
+        socketio.sleep(EVAL_POLL_INTERVAL)
+        waited += EVAL_POLL_INTERVAL
@@ -0,0 +1,55 @@
+"""add interview_attempt, the per-candidate summary read by the HR dashboards
+
+Revision ID: 3f6a9c2d71b4
+Revises: 8bf50ec1e2cd
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6a9c2d71b4'
+down_revision = '8bf50ec1e2cd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'interview_attempt' not in tables:
+        op.create_table(
+            'interview_attempt',
+            sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interview.id'), primary_key=True),
+            sa.Column('student_id', sa.Integer(), sa.ForeignKey('student.id'), primary_key=True),
+            sa.Column('question_count', sa.Integer(), nullable=False),
+            sa.Column('answered_count', sa.Integer(), nullable=False),
+            sa.Column('evaluated_count', sa.Integer(), nullable=False),
+            sa.Column('avg_score', sa.Float()),
+            sa.Column('started_at', sa.DateTime()),
+            sa.Column('completed_at', sa.DateTime()),
+            sa.Column('updated_at', sa.DateTime()),
+        )
+        op.create_index('ix_interview_attempt_student_id', 'interview_attempt', ['student_id'])
+
+    # Backfill from the existing answers (the same aggregates as interview_attempts.rebuild_attempts)
+    if 'question_answer' not in tables:
+        return
+    op.execute("""
+        INSERT INTO interview_attempt
+            (interview_id, student_id, question_count, answered_count, evaluated_count, avg_score, updated_at)
+        SELECT interview_id, student_id, COUNT(id),
+               COUNT(CASE WHEN answer_text != '' THEN 1 END), COUNT(score), AVG(score), CURRENT_TIMESTAMP
+        FROM question_answer
+        WHERE interview_id IS NOT NULL AND student_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM interview_attempt a
+                          WHERE a.interview_id = question_answer.interview_id
+                            AND a.student_id = question_answer.student_id)
+        GROUP BY interview_id, student_id
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_interview_attempt_student_id', table_name='interview_attempt')
+    op.drop_table('interview_attempt')
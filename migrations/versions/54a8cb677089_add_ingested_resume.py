@@ -0,0 +1,34 @@
+"""add ingested_resume, the files processed by flask ingest-resumes
+
+Revision ID: 54a8cb677089
+Revises: a27b8971f5b0
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '54a8cb677089'
+down_revision = 'a27b8971f5b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'ingested_resume' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'ingested_resume',
+        sa.Column('sha256', sa.String(length=64), primary_key=True),
+        sa.Column('filename', sa.String(length=255)),
+        sa.Column('email', sa.String(length=120)),
+        sa.Column('status', sa.String(length=20)),
+        sa.Column('error', sa.Text()),
+        sa.Column('ingested_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table('ingested_resume')
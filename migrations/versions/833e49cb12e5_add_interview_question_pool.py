@@ -0,0 +1,37 @@
+"""add interview.num_questions and the pre-generated question pool
+
+Revision ID: 833e49cb12e5
+Revises: ba32ecf1bfb7
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '833e49cb12e5'
+down_revision = 'ba32ecf1bfb7'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    sa.Column('num_questions', sa.Integer()),
+    sa.Column('question_pool', sa.Text()),  # JSON list of pre-generated AI questions
+    sa.Column('question_pool_source', sa.String(length=64)),  # SHA-256 of the job_desc it was built from
+]
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('interview')}
+    with op.batch_alter_table('interview') as batch_op:
+        for column in COLUMNS:
+            if column.name not in existing:
+                batch_op.add_column(column)
+
+
+def downgrade():
+    with op.batch_alter_table('interview') as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,38 @@
+"""add evaluation_job, the queue of candidate evaluations run by evaluation_worker
+
+Revision ID: 86c3be5adfd9
+Revises: 833e49cb12e5
+Create Date: 2026-10-17 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '86c3be5adfd9'
+down_revision = '833e49cb12e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'evaluation_job' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'evaluation_job',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interview.id'), nullable=False),
+        sa.Column('student_id', sa.Integer(), sa.ForeignKey('student.id'), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_until', sa.DateTime()),
+        sa.Column('email_sent', sa.Boolean()),
+        sa.Column('last_error', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table('evaluation_job')
@@ -0,0 +1,40 @@
+"""add indexes for the hot HR, meeting and job queries
+
+Revision ID: 8bf50ec1e2cd
+Revises: d816a37035d1
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8bf50ec1e2cd'
+down_revision = 'd816a37035d1'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns) — mirrors the indexes declared in models.py
+INDEXES = [
+    ('question_answer', 'ix_question_answer_interview_id_student_id', ['interview_id', 'student_id']),
+    ('question_answer', 'ix_question_answer_student_id', ['student_id']),
+    ('interview', 'ix_interview_hr_id_created_at', ['hr_id', 'created_at']),
+    ('interview', 'ix_interview_created_at', ['created_at']),
+    ('hr', 'ix_hr_user_id', ['user_id']),
+    ('student', 'ix_student_user_id', ['user_id']),
+    ('evaluation_job', 'ix_evaluation_job_interview_id_student_id', ['interview_id', 'student_id']),
+    ('evaluation_job', 'ix_evaluation_job_status_locked_until', ['status', 'locked_until']),
+]
+
+
+def upgrade():
+    # Databases created with db.create_all() from newer models already have them
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for table, name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
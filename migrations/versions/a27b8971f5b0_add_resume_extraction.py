@@ -0,0 +1,36 @@
+"""add resume_extraction, the cache of text extracted from uploaded resumes
+
+Revision ID: a27b8971f5b0
+Revises: 86c3be5adfd9
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a27b8971f5b0'
+down_revision = '86c3be5adfd9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'resume_extraction' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'resume_extraction',
+        sa.Column('sha256', sa.String(length=64), primary_key=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('size_bytes', sa.Integer()),
+        sa.Column('hits', sa.Integer()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('last_used_at', sa.DateTime()),
+    )
+    op.create_index('ix_resume_extraction_last_used_at', 'resume_extraction', ['last_used_at'])
+
+
+def downgrade():
+    op.drop_index('ix_resume_extraction_last_used_at', table_name='resume_extraction')
+    op.drop_table('resume_extraction')
@@ -0,0 +1,84 @@
+"""initial schema: users, students, HRs, interviews and their questions
+
+Revision ID: ba32ecf1bfb7
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ba32ecf1bfb7'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created with db.create_all() already have these tables
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in tables:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('email', sa.String(length=120), nullable=False, unique=True),
+            sa.Column('password_hash', sa.String(length=128)),
+            sa.Column('user_type', sa.Enum('ADMIN', 'STUDENT', 'HR', name='usertype'), nullable=False),
+        )
+    if 'student' not in tables:
+        op.create_table(
+            'student',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False, unique=True),
+            sa.Column('phone', sa.String(length=20)),
+            sa.Column('resume', sa.Text()),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id')),
+        )
+    if 'hr' not in tables:
+        op.create_table(
+            'hr',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('email', sa.String(length=120), nullable=False, unique=True),
+            sa.Column('phone', sa.String(length=20)),
+            sa.Column('company_name', sa.String(length=100)),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id')),
+        )
+    if 'interview' not in tables:
+        op.create_table(
+            'interview',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('link_id', sa.String(length=36), nullable=False, unique=True),
+            sa.Column('type', sa.String(length=50)),
+            sa.Column('job_title', sa.String(length=100)),
+            sa.Column('company_name', sa.String(length=100)),
+            sa.Column('job_desc', sa.Text()),
+            sa.Column('custom_questions', sa.Text()),
+            sa.Column('created_at', sa.DateTime()),
+            sa.Column('used', sa.Boolean()),
+            sa.Column('student_id', sa.Integer(), sa.ForeignKey('student.id')),
+            sa.Column('hr_id', sa.Integer(), sa.ForeignKey('hr.id')),
+        )
+    if 'question_answer' not in tables:
+        op.create_table(
+            'question_answer',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('text', sa.Text(), nullable=False),
+            sa.Column('answer_text', sa.Text()),
+            sa.Column('llm_answer_text', sa.Text()),
+            sa.Column('score', sa.Float()),
+            sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interview.id')),
+            sa.Column('student_id', sa.Integer(), sa.ForeignKey('student.id')),
+        )
+
+
+def downgrade():
+    op.drop_table('question_answer')
+    op.drop_table('interview')
+    op.drop_table('hr')
+    op.drop_table('student')
+    op.drop_table('user')
+    sa.Enum(name='usertype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""add id to the evaluation job claim index, so claim_next_job reads jobs in order
+
+Revision ID: c5e1d7a94b20
+Revises: 3f6a9c2d71b4
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1d7a94b20'
+down_revision = '3f6a9c2d71b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_evaluation_job_status_locked_until', table_name='evaluation_job', if_exists=True)
+    op.create_index('ix_evaluation_job_status_locked_until_id', 'evaluation_job',
+                    ['status', 'locked_until', 'id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_evaluation_job_status_locked_until_id', table_name='evaluation_job', if_exists=True)
+    op.create_index('ix_evaluation_job_status_locked_until', 'evaluation_job',
+                    ['status', 'locked_until'], if_not_exists=True)
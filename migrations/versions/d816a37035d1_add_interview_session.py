@@ -0,0 +1,35 @@
+"""add interview_session, the server-side state of interviews in progress
+
+Revision ID: d816a37035d1
+Revises: 54a8cb677089
+Create Date: 2026-10-17 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd816a37035d1'
+down_revision = '54a8cb677089'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'interview_session' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'interview_session',
+        sa.Column('id', sa.String(length=32), primary_key=True),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_interview_session_expires_at', 'interview_session', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_interview_session_expires_at', table_name='interview_session')
+    op.drop_table('interview_session')
@@ -0,0 +1,28 @@
+"""add interview_session.questions, the questions streamed in so far
+
+Revision ID: e4b7a1c9d352
+Revises: c5e1d7a94b20
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7a1c9d352'
+down_revision = 'c5e1d7a94b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('interview_session')}
+    if 'questions' not in existing:
+        with op.batch_alter_table('interview_session') as batch_op:
+            batch_op.add_column(sa.Column('questions', sa.Text()))
+
+
+def downgrade():
+    with op.batch_alter_table('interview_session') as batch_op:
+        batch_op.drop_column('questions')
@@ -49,20 +49,47 @@ class Student(db.Model, UserMixin):
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20))
     resume = db.Column(db.Text)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
     interviews = db.relationship('Interview', backref='student', lazy=True, cascade="all, delete-orphan")
     qa_pairs = db.relationship('QuestionAnswer', backref='student', lazy=True, cascade="all, delete-orphan")
+    attempts = db.relationship('InterviewAttempt', backref='student', lazy=True, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f'<Student {self.name}>'
 
+class ResumeExtraction(db.Model):
+    """Text extracted from an uploaded resume, keyed by the SHA-256 of the file bytes."""
+    __tablename__ = 'resume_extraction'
+    sha256 = db.Column(db.String(64), primary_key=True)
+    text = db.Column(db.Text, nullable=False)
+    size_bytes = db.Column(db.Integer)
+    hits = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime)
+    last_used_at = db.Column(db.DateTime, index=True)  # eviction order
+
+    def __repr__(self):
+        return f'<ResumeExtraction {self.sha256[:12]}>'
+
+class IngestedResume(db.Model):
+    """A resume file processed by `flask ingest-resumes`, so reruns skip it."""
+    __tablename__ = 'ingested_resume'
+    sha256 = db.Column(db.String(64), primary_key=True)
+    filename = db.Column(db.String(255))
+    email = db.Column(db.String(120))
+    status = db.Column(db.String(20))  # ingested | no_email | failed
+    error = db.Column(db.Text)
+    ingested_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<IngestedResume {self.filename} {self.status}>'
+
 class HR(db.Model, UserMixin):
     __tablename__ = 'hr'
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20))
     company_name = db.Column(db.String(100))
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)
     interviews = db.relationship('Interview', backref='hr', lazy=True)
 
     def __repr__(self):
@@ -70,6 +97,10 @@ class HR(db.Model, UserMixin):
 
 class Interview(db.Model):
     __tablename__ = 'interview'
+    __table_args__ = (
+        db.Index('ix_interview_hr_id_created_at', 'hr_id', 'created_at'),  # HR pages
+        db.Index('ix_interview_created_at', 'created_at'),  # retention job
+    )
     id = db.Column(db.Integer, primary_key=True)
     link_id = db.Column(db.String(36), unique=True, nullable=False)
     type = db.Column(db.String(50))
@@ -77,11 +108,16 @@ class Interview(db.Model):
     company_name = db.Column(db.String(100))  # New: Company Name
     job_desc = db.Column(db.Text)
     custom_questions = db.Column(db.Text)
+    num_questions = db.Column(db.Integer)
+    question_pool = db.Column(db.Text)  # JSON list of pre-generated AI questions
+    question_pool_source = db.Column(db.String(64))  # SHA-256 of the job_desc the pool was built from
     created_at = db.Column(db.DateTime)
     used = db.Column(db.Boolean, default=False)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'))
     hr_id = db.Column(db.Integer, db.ForeignKey('hr.id'))
     qa_pairs = db.relationship('QuestionAnswer', backref='interview', lazy=True, cascade="all, delete-orphan")
+    evaluation_jobs = db.relationship('EvaluationJob', backref='interview', lazy=True, cascade="all, delete-orphan")
+    attempts = db.relationship('InterviewAttempt', backref='interview', lazy=True, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f'<Interview {self.link_id} | {self.job_title} at {self.company_name}>'
@@ -89,6 +125,10 @@ class Interview(db.Model):
 
 class QuestionAnswer(db.Model):
     __tablename__ = 'question_answer'
+    __table_args__ = (
+        db.Index('ix_question_answer_interview_id_student_id', 'interview_id', 'student_id'),
+        db.Index('ix_question_answer_student_id', 'student_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
     answer_text = db.Column(db.Text)
@@ -99,3 +139,70 @@ class QuestionAnswer(db.Model):
 
     def __repr__(self):
         return f'<QA Q:{self.text[:30]}... A:{(self.answer_text or "")[:30]}...>'
+
+
+class InterviewAttempt(db.Model):
+    """
+    One candidate's attempt at an interview, aggregated from its QuestionAnswer
+    rows by interview_attempts.refresh_attempt so the HR dashboards don't have to.
+    """
+    __tablename__ = 'interview_attempt'
+    interview_id = db.Column(db.Integer, db.ForeignKey('interview.id'), primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), primary_key=True, index=True)
+    question_count = db.Column(db.Integer, nullable=False, default=0)
+    answered_count = db.Column(db.Integer, nullable=False, default=0)
+    evaluated_count = db.Column(db.Integer, nullable=False, default=0)
+    avg_score = db.Column(db.Float)  # over evaluated answers
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)  # last answer submitted
+    updated_at = db.Column(db.DateTime)
+
+    @property
+    def duration_seconds(self):
+        if self.started_at and self.completed_at:
+            return int((self.completed_at - self.started_at).total_seconds())
+        return None
+
+    def __repr__(self):
+        return f'<InterviewAttempt interview={self.interview_id} student={self.student_id}>'
+
+
+class EvaluationJob(db.Model):
+    """Queued evaluation of one candidate's answers, processed by evaluation_worker."""
+    __tablename__ = 'evaluation_job'
+    __table_args__ = (
+        db.Index('ix_evaluation_job_interview_id_student_id', 'interview_id', 'student_id'),
+        db.Index('ix_evaluation_job_status_locked_until_id', 'status', 'locked_until', 'id'),  # claim_next_job
+    )
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    interview_id = db.Column(db.Integer, db.ForeignKey('interview.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    locked_until = db.Column(db.DateTime)  # lease of the worker running it, or earliest retry time
+    email_sent = db.Column(db.Boolean, default=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<EvaluationJob {self.id} {self.status} interview={self.interview_id} student={self.student_id}>'
+
+
+class InterviewSession(db.Model):
+    """Server-side state of an interview in progress; the cookie only holds its id."""
+    __tablename__ = 'interview_session'
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(16), nullable=False)  # student | hr
+    data = db.Column(db.Text, nullable=False)  # JSON
+    questions = db.Column(db.Text)  # JSON list of streamed questions; only the question generator writes it
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<InterviewSession {self.id} {self.kind}>'
@@ -0,0 +1,96 @@
+import os
+import datetime
+
+from sqlalchemy import tuple_
+
+from models import Interview
+
+
+# Interviews per page on the HR list pages (?page_size= overrides it, up to HR_MAX_PAGE_SIZE)
+HR_PAGE_SIZE = int(os.getenv("HR_PAGE_SIZE", 50))
+HR_MAX_PAGE_SIZE = int(os.getenv("HR_MAX_PAGE_SIZE", 200))
+# Rows fetched from the database at a time while a page streams out
+_FETCH_ROWS = 50
+
+
+def page_size_arg(args):
+    return max(1, min(args.get('page_size', HR_PAGE_SIZE, type=int) or HR_PAGE_SIZE, HR_MAX_PAGE_SIZE))
+
+
+def encode_cursor(interview):
+    created = interview.created_at.isoformat() if interview.created_at else ''
+    return f'{created}~{interview.id}'
+
+
+def decode_cursor(value):
+    """(created_at, id) from a cursor made by encode_cursor, or None if it's missing or malformed."""
+    try:
+        created, interview_id = value.rsplit('~', 1)
+        return (datetime.datetime.fromisoformat(created) if created else None), int(interview_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def older_than(cursor):
+    """Rows after `cursor` within its phase: dated rows by (created_at, id), undated ones by id."""
+    created_at, interview_id = cursor
+    if created_at is None:
+        return Interview.id < interview_id
+    # A row-value comparison stays a single range seek on (hr_id, created_at)
+    return tuple_(Interview.created_at, Interview.id) < tuple_(created_at, interview_id)
+
+
+def keyset_queries(query, cursor=None):
+    """
+    The phases of a keyset walk over `query`, newest first: dated interviews
+    by (created_at, id), then the undated ones by id. Each phase is a plain
+    index range, so a deep page costs the same as the first one.
+    """
+    if cursor is None or cursor[0] is not None:
+        dated = query.filter(Interview.created_at.isnot(None))
+        if cursor:
+            dated = dated.filter(older_than(cursor))
+        yield dated.order_by(Interview.created_at.desc(), Interview.id.desc())
+    undated = query.filter(Interview.created_at.is_(None))
+    if cursor and cursor[0] is None:
+        undated = undated.filter(older_than(cursor))
+    yield undated.order_by(Interview.id.desc())
+
+
+class InterviewPage:
+    """
+    One page of an Interview query, newest first, keyset-paginated on
+    (created_at, id): the page after `after` starts below that cursor, so deep
+    pages cost the same as the first one (ix_interview_hr_id_created_at).
+    Undated interviews come last, as a second phase of the walk.
+
+    Iterating runs the queries and yields rows as they are fetched, so a
+    streamed template can send the first rows before the last are read;
+    `next_cursor` is set once iteration reaches the end of the page.
+    """
+
+    def __init__(self, query, after=None, page_size=HR_PAGE_SIZE):
+        self.after = after
+        self.page_size = page_size
+        self.next_cursor = None
+        self.query = query
+        self.cursor = decode_cursor(after)
+
+    def __iter__(self):
+        last, count = None, 0
+        for phase in keyset_queries(self.query, self.cursor):
+            # The page's rows plus one, which only tells there is another page
+            for interview in phase.limit(self.page_size + 1 - count).yield_per(_FETCH_ROWS):
+                count += 1
+                if count > self.page_size:
+                    # The last row the limit lets through, so the result is read to the end
+                    self.next_cursor = encode_cursor(last)
+                    continue
+                last = interview
+                yield interview
+            if self.next_cursor:
+                break
+
+    @classmethod
+    def from_request(cls, query, args):
+        return cls(query, after=args.get('after'), page_size=page_size_arg(args))
@@ -0,0 +1,104 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+
+# Answers at least this similar (TF-IDF cosine) to their question are treated as a copy of it
+PRESCORE_COPY_SIMILARITY = float(os.getenv("PRESCORE_COPY_SIMILARITY", 0.85))
+# Answers at least this similar to a known ideal answer are scored without the LLM
+PRESCORE_IDEAL_SIMILARITY = float(os.getenv("PRESCORE_IDEAL_SIMILARITY", 0.9))
+
+NON_ANSWERS = {
+    'skip', 'pass', 'next', 'no', 'none', 'na', 'n a', 'nil', 'nothing', 'no idea', 'not sure',
+    'idk', 'i dont know', 'i do not know', 'dont know', 'i dont remember', 'no answer',
+}
+NO_ANSWER_TEXT = "No evaluation: the answer was empty or did not address the question."
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_stats = {'answers': 0, 'prescored': 0, 'sent_to_llm': 0}
+_stats_lock = threading.Lock()
+
+
+def _tokens(text):
+    return _TOKEN.findall((text or '').lower().replace("'", ''))
+
+
+def tfidf_matrix(docs):
+    """Row-normalized TF-IDF matrix (len(docs) x vocabulary) of the given texts."""
+    tokenized = [_tokens(doc) for doc in docs]
+    vocabulary = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    counts = np.zeros((len(docs), max(len(vocabulary), 1)))
+    for row, tokens in enumerate(tokenized):
+        if tokens:
+            np.add.at(counts[row], [vocabulary[token] for token in tokens], 1)
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(docs)) / (1 + document_frequency)) + 1
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
+
+
+def prescore_answers(pairs, ideal_answers=None):
+    """
+    Score the clear-cut answers of a whole interview locally, in one pass.
+
+    `pairs` is a list of (question, answer); `ideal_answers` optionally maps a
+    question to an ideal answer already known for it. Returns one entry per
+    pair: (ideal_answer, score) when the answer is clear-cut, or None when it
+    needs the LLM.
+    """
+    n = len(pairs)
+    if not n:
+        return []
+    ideal_answers = ideal_answers or {}
+    questions = [question for question, _ in pairs]
+    answers = [answer or '' for _, answer in pairs]
+    ideals = [ideal_answers.get(question) for question in questions]
+
+    matrix = tfidf_matrix(questions + answers + [ideal or '' for ideal in ideals])
+    q_vectors, a_vectors, ideal_vectors = matrix[:n], matrix[n:2 * n], matrix[2 * n:]
+    question_similarity = (q_vectors * a_vectors).sum(axis=1)
+    ideal_similarity = (ideal_vectors * a_vectors).sum(axis=1)
+
+    normalized = [' '.join(_tokens(answer)) for answer in answers]
+    word_counts = np.array([len(text.split()) for text in normalized])
+    question_words = np.array([len(_tokens(question)) for question in questions])
+    has_ideal = np.array([bool(ideal) for ideal in ideals])
+
+    # Only answers that can't be right are scored 0 here; short or repeated
+    # answers ("5432", "PUT") may be correct, so the LLM judges those
+    blank = np.array([not text or text in NON_ANSWERS for text in normalized])
+    copied_question = (question_similarity >= PRESCORE_COPY_SIMILARITY) & (word_counts <= question_words + 2)
+    zero = blank | copied_question
+    matches_ideal = ~zero & has_ideal & (ideal_similarity >= PRESCORE_IDEAL_SIMILARITY)
+
+    results = []
+    for i in range(n):
+        if zero[i]:
+            results.append((ideals[i] or NO_ANSWER_TEXT, 0))
+        elif matches_ideal[i]:
+            results.append((ideals[i], int(round(ideal_similarity[i] * 100))))
+        else:
+            results.append(None)
+
+    prescored = int(zero.sum() + matches_ideal.sum())
+    with _stats_lock:
+        _stats['answers'] += n
+        _stats['prescored'] += prescored
+        _stats['sent_to_llm'] += n - prescored
+    return results
+
+
+def prescore_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['prescored_rate'] = round(stats['prescored'] / stats['answers'], 4) if stats['answers'] else 0.0
+    return stats
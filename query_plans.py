@@ -0,0 +1,123 @@
+import random
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+from extensions import db
+from pagination import keyset_queries
+from evaluation_worker import runnable_job_queries
+from models import User, UserType, HR, Student, Interview, QuestionAnswer, EvaluationJob, InterviewSession, InterviewAttempt
+
+
+def hot_queries():
+    """
+    (name, statement[, tables it may scan[, a step the plan must contain]]) for
+    the queries on the meeting, HR dashboard and background-job paths.
+    """
+    now = datetime.datetime(2025, 6, 1)
+    hr_interviews = sa.select(Interview).where(Interview.hr_id == 5)
+    dated_page = next(keyset_queries(hr_interviews, (datetime.datetime(2024, 6, 1), 1200))).limit(51)
+    undated_page = next(keyset_queries(hr_interviews, (None, 1200))).limit(51)
+    return [
+        ('user by email', sa.select(User).where(User.email == 'user50@example.com')),
+        ('hr by email', sa.select(HR).where(HR.email == 'hr5@example.com')),
+        ('hr by user_id', sa.select(HR).where(HR.user_id == 5)),
+        ('student by email', sa.select(Student).where(Student.email == 'student50@example.com')),
+        ('interview by link_id', sa.select(Interview).where(Interview.link_id == 'link-50')),
+        ('interviews of an hr', sa.select(Interview).where(Interview.hr_id == 5)
+            .order_by(Interview.created_at.desc())),
+        # A deep page must seek to the cursor, not read every newer row of the HR
+        ('interview page of an hr (dated)', dated_page, set(), 'created_at<?'),
+        ('interview page of an hr (undated)', undated_page, set(), 'created_at=?'),
+        ('candidate qa rows', sa.select(QuestionAnswer).where(
+            QuestionAnswer.interview_id == 50, QuestionAnswer.student_id == 7)),
+        ('students of an interview', sa.select(Student).join(QuestionAnswer)
+            .where(QuestionAnswer.interview_id == 50).distinct()),
+        ('attempts of an interview', sa.select(InterviewAttempt).where(InterviewAttempt.interview_id == 50)),
+        ('qa rows of a student', sa.select(QuestionAnswer).where(QuestionAnswer.student_id == 7)),
+        ('known ideal answers', sa.select(QuestionAnswer.text, QuestionAnswer.llm_answer_text)
+            .where(QuestionAnswer.interview_id == 50, QuestionAnswer.text.in_(['Question 1', 'Question 2']),
+                   QuestionAnswer.score > 0, QuestionAnswer.llm_answer_text.isnot(None))
+            .order_by(QuestionAnswer.id.desc())),
+        # The retention job works per HR, and there are few HRs compared to interviews
+        ('old interviews', sa.select(HR).join(Interview)
+            .where(Interview.created_at <= now - datetime.timedelta(days=180)).distinct(), {'hr'}),
+        ('evaluation job of a candidate', sa.select(EvaluationJob).where(
+            EvaluationJob.interview_id == 50, EvaluationJob.student_id == 7)),
+        *[(f'runnable evaluation jobs ({kind})', query) for kind, query
+          in zip(['new', 'retry due', 'lease expired'], runnable_job_queries(now))],
+        ('expired interview states', sa.select(InterviewSession.id).where(InterviewSession.expires_at <= now)),
+    ]
+
+
+def seed(connection, hrs=50, interviews_per_hr=40, candidates_per_interview=5, questions=10):
+    """Fill an empty database with a synthetic dataset shaped like production."""
+    rng = random.Random(42)
+    started = datetime.datetime(2024, 1, 1)
+    students = hrs * 20
+
+    connection.execute(sa.insert(User), [
+        {'id': i, 'email': f'user{i}@example.com', 'user_type': UserType.HR if i <= hrs else UserType.STUDENT}
+        for i in range(1, hrs + students + 1)
+    ])
+    connection.execute(sa.insert(HR), [
+        {'id': i, 'email': f'hr{i}@example.com', 'user_id': i} for i in range(1, hrs + 1)
+    ])
+    connection.execute(sa.insert(Student), [
+        {'id': i, 'name': f'Student {i}', 'email': f'student{i}@example.com', 'user_id': hrs + i}
+        for i in range(1, students + 1)
+    ])
+
+    # Most jobs are finished; a few wait to run, to be retried or on a lease
+    lease_end = datetime.datetime(2025, 6, 1)
+    job_states = [(EvaluationJob.DONE, None), (EvaluationJob.FAILED, None), (EvaluationJob.PENDING, None),
+                  (EvaluationJob.PENDING, lease_end), (EvaluationJob.RUNNING, lease_end)]
+
+    interview_rows, qa_rows, job_rows = [], [], []
+    for interview_id in range(1, hrs * interviews_per_hr + 1):
+        interview_rows.append({
+            'id': interview_id, 'link_id': f'link-{interview_id}', 'type': 'jd',
+            'hr_id': (interview_id - 1) % hrs + 1,
+            'created_at': started + datetime.timedelta(hours=interview_id * 3),
+        })
+        for student_id in rng.sample(range(1, students + 1), candidates_per_interview):
+            qa_rows.extend({'text': f'Question {n}', 'answer_text': 'Answer', 'score': rng.randint(0, 100),
+                            'interview_id': interview_id, 'student_id': student_id} for n in range(questions))
+            status, locked_until = rng.choices(job_states, weights=[90, 2, 4, 2, 2])[0]
+            job_rows.append({'interview_id': interview_id, 'student_id': student_id, 'status': status,
+                             'locked_until': locked_until and locked_until + datetime.timedelta(
+                                 minutes=rng.randint(-30, 30)),
+                             'attempts': 1})
+    connection.execute(sa.insert(Interview), interview_rows)
+    connection.execute(sa.insert(QuestionAnswer), qa_rows)
+    connection.execute(sa.insert(EvaluationJob), job_rows)
+    connection.exec_driver_sql("ANALYZE")
+    return {'interviews': len(interview_rows), 'question_answers': len(qa_rows), 'evaluation_jobs': len(job_rows)}
+
+
+def explain(connection, statement):
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}))
+    return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_query_plans(**seed_options):
+    """
+    Seed a throwaway in-memory SQLite database from the models, then EXPLAIN
+    every hot query. Returns (dataset sizes, [(name, plan lines, ok)]); a
+    query is not ok when any step scans a whole table (or a whole index), or
+    when its plan lacks the step it must contain.
+    """
+    engine = sa.create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    results = []
+    with engine.begin() as connection:
+        sizes = seed(connection, **seed_options)
+        for name, statement, *options in hot_queries():
+            plan = explain(connection, statement)
+            allowed, expected = (options + [set(), None])[:2]
+            full_scans = [step for step in plan if step.startswith('SCAN ') and step.split()[1] not in allowed]
+            missing = expected and not any(expected in step for step in plan)
+            results.append((name, plan, not full_scans and not missing))
+    engine.dispose()
+    return sizes, results
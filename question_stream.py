@@ -0,0 +1,128 @@
+import os
+import time
+import uuid
+import threading
+
+from llm_model import stream_questions
+
+
+# Seconds get_next_question waits for a question that is still being generated
+QUESTION_WAIT_TIMEOUT = float(os.getenv("QUESTION_WAIT_TIMEOUT", 60))
+# Seconds an abandoned stream is kept before it is dropped
+QUESTION_STREAM_TTL = int(os.getenv("QUESTION_STREAM_TTL", 3 * 3600))
+# Seconds between reads of the stored questions while another process generates them
+QUESTION_POLL_INTERVAL = float(os.getenv("QUESTION_POLL_INTERVAL", 0.5))
+
+# Streams generated by this process; every question is also stored (see on_question),
+# so other processes serve them from the database
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+class QuestionStream:
+    """Questions of one interview, filled in by a background generator as they arrive."""
+
+    def __init__(self, total):
+        self.total = total
+        self.questions = []
+        self.done = False
+        self.created_at = time.time()
+        self._cond = threading.Condition()
+
+    def push(self, question, on_question=None):
+        if on_question:
+            # Stored before it is served, so any process that sees it can read it back
+            try:
+                on_question(self.questions + [question])
+            except Exception as e:
+                print(f"Storing streamed question failed: {e}")
+        with self._cond:
+            self.questions.append(question)
+            self._cond.notify_all()
+
+    def finish(self):
+        with self._cond:
+            self.done = True
+            self._cond.notify_all()
+
+    def wait_for(self, count, timeout=QUESTION_WAIT_TIMEOUT):
+        """Block until `count` questions exist (or generation ends) and return them."""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.questions) >= count or self.done, timeout=timeout)
+            return list(self.questions[:count])
+
+
+def _generate(stream, prompt, expected, fallback, extra, on_question):
+    try:
+        for question in stream_questions(prompt):
+            stream.push(question, on_question)
+            if len(stream.questions) >= expected:
+                break
+    except Exception as e:
+        print(f"Question streaming error: {e}")
+    finally:
+        # Always deliver exactly `expected` AI questions so the announced total holds
+        while len(stream.questions) < expected:
+            stream.push(fallback, on_question)
+        for question in extra:
+            stream.push(question, on_question)
+        stream.finish()
+
+
+def start_question_stream(prompt, expected, fallback, extra=(), on_question=None):
+    """
+    Start generating `expected` questions from `prompt` in the background,
+    followed by the `extra` (e.g. custom) questions. Returns the stream id.
+    `on_question(questions)` is called with the questions so far each time
+    one arrives, to store them where any process can read them.
+    """
+    _drop_expired()
+    stream_id = uuid.uuid4().hex
+    stream = QuestionStream(expected + len(extra))
+    with _streams_lock:
+        _streams[stream_id] = stream
+
+    threading.Thread(
+        target=_generate,
+        args=(stream, prompt, expected, fallback, list(extra), on_question),
+        name=f"question-stream-{stream_id[:8]}",
+        daemon=True
+    ).start()
+    return stream_id
+
+
+def get_stream(stream_id):
+    if not stream_id:
+        return None
+    with _streams_lock:
+        return _streams.get(stream_id)
+
+
+def wait_for_questions(stream_id, load, count, timeout=QUESTION_WAIT_TIMEOUT):
+    """
+    Wait until `count` questions of a stream are stored and return the stored
+    questions, as read by `load()`. The process generating the stream wakes up
+    as soon as one arrives; any other process polls `load()` instead.
+    """
+    stream = get_stream(stream_id)
+    if stream:
+        stream.wait_for(count, timeout)
+        return load()
+    deadline = time.monotonic() + timeout
+    questions = load()
+    while len(questions) < count and time.monotonic() < deadline:
+        time.sleep(QUESTION_POLL_INTERVAL)
+        questions = load()
+    return questions
+
+
+def discard_stream(stream_id):
+    with _streams_lock:
+        _streams.pop(stream_id, None)
+
+
+def _drop_expired():
+    cutoff = time.time() - QUESTION_STREAM_TTL
+    with _streams_lock:
+        for stream_id in [sid for sid, s in _streams.items() if s.created_at < cutoff]:
+            del _streams[stream_id]
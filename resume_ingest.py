@@ -0,0 +1,175 @@
+import os
+import re
+import time
+import hashlib
+import zipfile
+import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+
+from extensions import db
+from models import Student, IngestedResume
+from resume_utils import extract_resume_text, SUPPORTED_RESUME_TYPES, MAX_RESUME_BYTES
+
+
+# Students upserted per transaction
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 100))
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'\+?\d[\d\s().-]{8,}\d')
+NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.' -]{1,60}$")
+
+
+def iter_resume_files(path):
+    """Yield (name, bytes) for every PDF/DOCX resume in a directory tree or zip archive."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if _is_resume(info.filename) and info.file_size <= MAX_RESUME_BYTES:
+                    yield info.filename, archive.read(info)
+        return
+
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            full_path = os.path.join(root, filename)
+            if _is_resume(filename) and os.path.getsize(full_path) <= MAX_RESUME_BYTES:
+                with open(full_path, 'rb') as f:
+                    yield os.path.relpath(full_path, path), f.read()
+
+
+def _is_resume(filename):
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_RESUME_TYPES and not filename.endswith('/')
+
+
+def parse_resume_file(item, workers=None):
+    """
+    Extract text and contact details of one resume. The text is extracted in
+    a parser process under RESUME_PARSE_TIMEOUT, like uploads are; a parser
+    that overruns it is killed and the resume counts as failed.
+    """
+    name, sha256, data = item
+    try:
+        text = extract_resume_text(data, os.path.splitext(name)[1].lower(), workers=workers)
+    except Exception as e:
+        return {'name': name, 'sha256': sha256, 'error': str(e) or type(e).__name__}
+    if not text:
+        return {'name': name, 'sha256': sha256, 'error': 'No text extracted (empty resume or parse timeout)'}
+    return {'name': name, 'sha256': sha256, 'text': text, **extract_contact(text, name)}
+
+
+def extract_contact(text, filename):
+    email = EMAIL_PATTERN.search(text or '')
+    phone = PHONE_PATTERN.search(text or '')
+    candidate_name = None
+    for line in (text or '').splitlines()[:5]:
+        line = line.strip()
+        if NAME_PATTERN.match(line) and 2 <= len(line.split()) <= 4:
+            candidate_name = line.title()
+            break
+    if not candidate_name:
+        candidate_name = os.path.splitext(os.path.basename(filename))[0].replace('_', ' ').replace('-', ' ').title()
+    return {
+        'email': email.group(0).lower() if email else None,
+        'phone': re.sub(r'\s+', ' ', phone.group(0))[:20] if phone else None,
+        'student_name': candidate_name[:100],
+    }
+
+
+def _pending_items(path, stats):
+    """Resumes not ingested by an earlier run, as (name, sha256, bytes); failed ones are tried again."""
+    done = {sha for (sha,) in db.session.query(IngestedResume.sha256).filter_by(status='ingested')}
+    for name, data in iter_resume_files(path):
+        stats['files'] += 1
+        stats['bytes'] += len(data)
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 in done:
+            stats['skipped'] += 1
+            continue
+        done.add(sha256)
+        yield name, sha256, data
+
+
+def upsert_batch(results, stats):
+    """Create or update the Students of one batch of parsed resumes and mark the files ingested."""
+    now = datetime.datetime.utcnow()
+    by_email = {r['email']: r for r in results if not r.get('error') and r.get('email')}
+    existing = {}
+    if by_email:
+        # Emails are stored as typed at signup; match them case-insensitively
+        existing = {s.email.lower(): s for s in Student.query.filter(func.lower(Student.email).in_(list(by_email)))}
+
+    for email, result in by_email.items():
+        student = existing.get(email)
+        if student is None:
+            db.session.add(Student(name=result['student_name'], email=email,
+                                   phone=result['phone'], resume=result['text']))
+            stats['created'] += 1
+        else:
+            student.resume = result['text']
+            student.phone = student.phone or result['phone']
+            stats['updated'] += 1
+
+    for result in results:
+        if result.get('error'):
+            status, stats['failed'] = 'failed', stats['failed'] + 1
+        elif not result.get('email'):
+            status, stats['no_email'] = 'no_email', stats['no_email'] + 1
+        else:
+            status = 'ingested'
+        # merge: a file that failed in an earlier run already has a row
+        db.session.merge(IngestedResume(sha256=result['sha256'], filename=result['name'][:255],
+                                        email=result.get('email'), status=status,
+                                        error=result.get('error'), ingested_at=now))
+    db.session.commit()
+
+
+def ingest_resumes(path, workers=None, batch_size=None):
+    """
+    Parse every resume under `path` (directory or zip) in parser processes and
+    upsert Students by the email found in each resume. Files already ingested
+    are skipped, so an interrupted run can simply be rerun; files that failed
+    or had no email are tried again.
+    """
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    stats = {'files': 0, 'bytes': 0, 'skipped': 0, 'parsed': 0, 'failed': 0,
+             'no_email': 0, 'created': 0, 'updated': 0}
+    started = time.monotonic()
+
+    workers = workers or os.cpu_count()
+    batch = []
+
+    def handle(result):
+        stats['parsed'] += 1
+        batch.append(result)
+        if len(batch) >= batch_size:
+            upsert_batch(batch, stats)
+            batch.clear()
+            _print_progress(stats, started)
+
+    # One thread per parser process waits on its resume; the parsing itself runs in that process
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded window in flight so a large archive isn't read into memory at once
+        in_flight = deque()
+        for item in _pending_items(path, stats):
+            in_flight.append(pool.submit(parse_resume_file, item, workers))
+            if len(in_flight) >= workers * 4:
+                handle(in_flight.popleft().result())
+        while in_flight:
+            handle(in_flight.popleft().result())
+    if batch:
+        upsert_batch(batch, stats)
+
+    elapsed = time.monotonic() - started
+    stats['seconds'] = round(elapsed, 2)
+    stats['files_per_second'] = round(stats['parsed'] / elapsed, 2) if elapsed else 0.0
+    stats['mb_per_second'] = round(stats['bytes'] / 1024 / 1024 / elapsed, 2) if elapsed else 0.0
+    return stats
+
+
+def _print_progress(stats, started):
+    elapsed = time.monotonic() - started
+    rate = stats['parsed'] / elapsed if elapsed else 0
+    print(f"[Ingest] {stats['parsed']} parsed, {stats['skipped']} skipped, {stats['failed']} failed "
+          f"({rate:.1f} files/s)")
@@ -0,0 +1,317 @@
+import os
+import io
+import re
+import math
+import time
+import hashlib
+import datetime
+import threading
+import multiprocessing
+
+import pdfplumber, docx
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# Largest resume upload we accept, in bytes
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", 5 * 1024 * 1024))
+# Parser processes extracting text from uploaded resumes at once
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", 2))
+# Hard limit in seconds for extracting one resume; the parser process is killed after it
+RESUME_PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", 30))
+# Seconds after which no further PDF pages are read (the text so far is used)
+RESUME_PARSE_SOFT_TIMEOUT = float(os.getenv("RESUME_PARSE_SOFT_TIMEOUT", 10))
+# PDF pages read at most; resumes longer than this are unusual
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", 10))
+SUPPORTED_RESUME_TYPES = ['.pdf', '.docx', '.doc']
+# Extracted resumes kept in the database; least recently used ones are evicted
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", 5000))
+
+# Max tokens of resume text that goes into the question-generation prompt
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 1200))
+# Rough chars-per-token ratio for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+# Stop extracting once this much raw text is read; condensing keeps far less
+RESUME_EXTRACT_MAX_CHARS = int(os.getenv("RESUME_EXTRACT_MAX_CHARS", RESUME_TOKEN_BUDGET * CHARS_PER_TOKEN * 4))
+
+# Heading keywords per section, in the order sections are kept when over budget
+SECTION_PRIORITY = [
+    ('skills', ['skills', 'technical skills', 'core competencies', 'technologies', 'tech stack', 'tools']),
+    ('experience', ['experience', 'work experience', 'professional experience', 'employment',
+                    'work history', 'internship', 'internships']),
+    ('projects', ['projects', 'personal projects', 'academic projects', 'key projects']),
+    ('summary', ['summary', 'profile', 'objective', 'career objective', 'about me', 'professional summary']),
+    ('certifications', ['certifications', 'certificates', 'achievements', 'awards']),
+    ('education', ['education', 'academic background', 'qualifications']),
+]
+# Sections that never help generate technical questions
+DROPPED_SECTIONS = ['references', 'declaration', 'hobbies', 'interests', 'personal details',
+                    'personal information', 'languages known', 'extracurricular activities']
+
+BOILERPLATE_LINES = [
+    re.compile(r'^(curriculum vitae|resume|r[ée]sum[ée])$', re.I),
+    re.compile(r'^page \d+( of \d+)?$', re.I),
+    re.compile(r'references (are )?available (up)?on request', re.I),
+    re.compile(r'^i hereby declare', re.I),
+    re.compile(r'^[\W_]+$'),
+    re.compile(r'\S+@\S+\.\S+'),
+    re.compile(r'^(phone|mobile|tel|email|e-mail|linkedin|github|address)\s*[:\-]', re.I),
+    re.compile(r'^\+?[\d\s().\-]{7,}$'),
+]
+
+_HEADINGS = {keyword: name for name, keywords in SECTION_PRIORITY for keyword in keywords}
+_HEADINGS.update({keyword: 'dropped' for keyword in DROPPED_SECTIONS})
+
+# Bounds the parser processes running at once; sized on first use
+_parse_slots = None
+_parse_slots_lock = threading.Lock()
+
+_stats = {'resumes': 0, 'tokens_before': 0, 'tokens_after': 0, 'truncated': 0,
+          'cache_hits': 0, 'cache_misses': 0, 'cache_evictions': 0, 'parse_timeouts': 0}
+_stats_lock = threading.Lock()
+
+
+class ResumeError(ValueError):
+    """The uploaded resume can't be used (too large, wrong type)."""
+
+
+def read_upload(file, max_bytes=MAX_RESUME_BYTES):
+    """Read an uploaded file into memory, refusing anything over max_bytes."""
+    data = file.stream.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ResumeError(f"Resume is too large (max {max_bytes // (1024 * 1024)} MB).")
+    return data
+
+
+def extract_text_from_bytes(data, ext, max_pages=None, max_chars=None, soft_timeout=None):
+    """
+    Extract plain text from PDF/DOCX bytes without touching the disk.
+
+    PDF pages are read one at a time and reading stops after `max_pages`,
+    once `max_chars` of text is collected or after `soft_timeout` seconds,
+    returning whatever text was read so far.
+    """
+    max_pages = max_pages or RESUME_MAX_PAGES
+    max_chars = max_chars or RESUME_EXTRACT_MAX_CHARS
+    soft_timeout = soft_timeout or RESUME_PARSE_SOFT_TIMEOUT
+    started = time.monotonic()
+
+    if ext == '.pdf':
+        parts, size = [], 0
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for number, page in enumerate(pdf.pages):
+                if number >= max_pages or size >= max_chars or time.monotonic() - started > soft_timeout:
+                    break
+                text = page.extract_text() or ''
+                parts.append(text)
+                size += len(text) + 1
+        return "\n".join(parts)[:max_chars]
+    if ext in ['.docx', '.doc']:
+        doc = docx.Document(io.BytesIO(data))
+        return "\n".join([para.text for para in doc.paragraphs])[:max_chars]
+    raise ResumeError('Unsupported file type.')
+
+
+def get_parse_slots(workers=None):
+    """Semaphore bounding concurrent parser processes; `workers` sizes it on first use."""
+    global _parse_slots
+    with _parse_slots_lock:
+        if _parse_slots is None:
+            _parse_slots = threading.BoundedSemaphore(workers or RESUME_PARSE_WORKERS)
+        return _parse_slots
+
+
+def _parse_context():
+    """
+    Parser processes are forked from a forkserver that has this module loaded,
+    so starting one is cheap and safe while the web process runs threads.
+    Falls back to 'spawn' where forkserver isn't available (Windows).
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['__main__', 'resume_utils'])
+    return context
+
+
+def _parse_in_process(conn, data, ext):
+    """Parser process body: sends back ('ok', text) or ('error', exception)."""
+    try:
+        result = ('ok', extract_text_from_bytes(data, ext))
+    except Exception as e:
+        result = ('error', e)
+    try:
+        conn.send(result)
+    except Exception:
+        # e.g. an exception that can't be pickled
+        conn.send(('error', RuntimeError(str(result[1]))))
+    conn.close()
+
+
+def extract_resume_text(data, ext, timeout=RESUME_PARSE_TIMEOUT, workers=None):
+    """
+    Extract resume text in its own parser process, so CPU-heavy PDF extraction
+    runs outside the web worker. The hard timeout starts once the process runs
+    (waiting for a free slot doesn't count); a parser that overruns it is
+    killed on its own and the resume is treated as empty.
+    """
+    if ext not in SUPPORTED_RESUME_TYPES:
+        raise ResumeError('Unsupported file type.')
+    context = _parse_context()
+    with get_parse_slots(workers):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_parse_in_process, args=(sender, data, ext), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(timeout):
+                process.kill()
+                _count('parse_timeouts')
+                print(f"[Resume] Parsing took longer than {timeout:.0f}s; killed the parser")
+                return ''
+            status, result = receiver.recv()
+        except EOFError:
+            status, result = 'error', RuntimeError('The resume parser exited without a result')
+        finally:
+            receiver.close()
+            process.join()
+    if status == 'error':
+        raise result
+    return result
+
+
+def cached_resume_text(data, ext):
+    """
+    Extract resume text, reusing an earlier extraction of the same file bytes.
+    Re-uploads of an identical resume skip parsing entirely.
+    """
+    # Imported here so parser processes don't need the models
+    from extensions import db
+    from models import ResumeExtraction
+
+    digest = hashlib.sha256(data).hexdigest()
+    now = datetime.datetime.utcnow()
+    entry = db.session.get(ResumeExtraction, digest)
+    if entry is not None:
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = now
+        db.session.commit()
+        _count('cache_hits')
+        return entry.text
+
+    _count('cache_misses')
+    text = extract_resume_text(data, ext)
+    if not text:
+        return text
+    db.session.merge(ResumeExtraction(sha256=digest, text=text, size_bytes=len(data),
+                                      hits=0, created_at=now, last_used_at=now))
+    db.session.commit()
+    _evict_extractions(db, ResumeExtraction)
+    return text
+
+
+def _evict_extractions(db, ResumeExtraction):
+    excess = ResumeExtraction.query.count() - RESUME_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    oldest = db.session.query(ResumeExtraction.sha256).order_by(ResumeExtraction.last_used_at).limit(excess)
+    evicted = ResumeExtraction.query.filter(ResumeExtraction.sha256.in_(oldest.scalar_subquery())) \
+        .delete(synchronize_session=False)
+    db.session.commit()
+    _count('cache_evictions', evicted)
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text):
+    lines = [re.sub(r'[ \t\u00a0]+', ' ', line).strip() for line in (text or '').splitlines()]
+    return [line for line in lines if line]
+
+
+def _heading(line):
+    """Return the section name if `line` looks like a section heading."""
+    if len(line) > 40:
+        return None
+    key = re.sub(r'[^a-z ]', '', line.lower()).strip()
+    return _HEADINGS.get(key)
+
+
+def split_sections(lines):
+    """Group lines under the section heading they follow ('header' before the first one)."""
+    sections = {}
+    current = 'header'
+    for line in lines:
+        name = _heading(line)
+        if name:
+            current = name
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def condense_resume(text, token_budget=None):
+    """
+    Shrink extracted resume text to what matters for question generation:
+    normalized whitespace, no boilerplate or contact lines, and the skills,
+    experience and projects sections first, capped at `token_budget` tokens.
+    """
+    token_budget = token_budget or RESUME_TOKEN_BUDGET
+    char_budget = token_budget * CHARS_PER_TOKEN
+
+    lines = [line for line in normalize_whitespace(text)
+             if not any(pattern.search(line) for pattern in BOILERPLATE_LINES)]
+    sections = split_sections(lines)
+    sections.pop('dropped', None)
+
+    order = [name for name, _ in SECTION_PRIORITY] + ['header']
+    parts, used, truncated = [], 0, False
+    for name in order:
+        if name not in sections:
+            continue
+        heading = f"{name.title()}:" if name != 'header' else ''
+        kept = []
+        for line in ([heading] if heading else []) + sections[name]:
+            if used + len(line) + 1 > char_budget:
+                truncated = True
+                break
+            kept.append(line)
+            used += len(line) + 1
+        if len(kept) > (1 if heading else 0):
+            parts.extend(kept)
+        if truncated:
+            break
+
+    condensed = "\n".join(parts)
+    _record(text, condensed, truncated)
+    return condensed
+
+
+def _record(original, condensed, truncated):
+    before, after = estimate_tokens(original), estimate_tokens(condensed)
+    with _stats_lock:
+        _stats['resumes'] += 1
+        _stats['tokens_before'] += before
+        _stats['tokens_after'] += after
+        _stats['truncated'] += int(truncated)
+    print(f"[Resume] Condensed resume from ~{before} to ~{after} tokens"
+          + (" (truncated to budget)" if truncated else ""))
+
+
+def resume_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    count = stats['resumes']
+    stats['avg_tokens_before'] = round(stats['tokens_before'] / count, 1) if count else 0
+    stats['avg_tokens_after'] = round(stats['tokens_after'] / count, 1) if count else 0
+    stats['token_budget'] = RESUME_TOKEN_BUDGET
+    lookups = stats['cache_hits'] + stats['cache_misses']
+    stats['cache_hit_rate'] = round(stats['cache_hits'] / lookups, 4) if lookups else 0.0
+    return stats
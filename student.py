@@ -1,10 +1,12 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, abort
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort, current_app
 from models import db, User, UserType, Student
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from werkzeug.utils import secure_filename
-import os, logging
-import pdfplumber, docx
-from llm_model import model, evaluate_answer
+import os, logging, uuid
+from resume_utils import condense_resume, read_upload, cached_resume_text, ResumeError, SUPPORTED_RESUME_TYPES
+from question_stream import start_question_stream, wait_for_questions, discard_stream
+from interview_state import create_state, get_state, save_state, clear_state, current_state_id, store_questions, load_questions
+from evaluation_engine import evaluate_pairs, submit_evaluation, collect
 from email_utils import send_email
 
 
@@ -94,55 +96,50 @@ def student_interview():
             flash('Resume file required.', 'error')
             return render_template('student/resume_interview.html')
 
-        filename = secure_filename(file.filename)
-        ext = os.path.splitext(filename)[1].lower()
-        temp_dir = os.path.join('temp_resumes')
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_path = os.path.join(temp_dir, filename)
-        file.save(temp_path)
+        ext = os.path.splitext(secure_filename(file.filename))[1].lower()
+        if ext not in SUPPORTED_RESUME_TYPES:
+            flash('Unsupported file type.', 'error')
+            return render_template('student/resume_interview.html')
 
-        # Extract resume text
+        # Extract resume text in memory (or reuse the extraction of an identical upload)
         resume_text = ''
         try:
-            if ext == '.pdf':
-                with pdfplumber.open(temp_path) as pdf:
-                    resume_text = "\n".join([page.extract_text() or '' for page in pdf.pages])
-            elif ext in ['.docx', '.doc']:
-                doc = docx.Document(temp_path)
-                resume_text = "\n".join([para.text for para in doc.paragraphs])
-            else:
-                flash('Unsupported file type.', 'error')
-                os.remove(temp_path)
-                return render_template('student/resume_interview.html')
+            resume_text = cached_resume_text(read_upload(file), ext)
+        except ResumeError as e:
+            flash(str(e), 'error')
+            return render_template('student/resume_interview.html')
         except Exception as e:
             logging.error(f'Resume parse error: {e}')
             flash('Error reading resume: {e}')
-        finally:
-            os.remove(temp_path)
+
+        # Keep only the parts of the resume that matter, within the prompt token budget
+        condensed_resume = condense_resume(resume_text)
 
         # Generate Questions using LLM
         prompt = f"""
         Generate exactly {num_questions} technical interview questions based on this resume text:
-        {resume_text}
+        {condensed_resume}
         Return only the questions in a numbered list.
         """
-        try:
-            response = model.generate_content(prompt)
-            questions = []
-            for line in response.text.strip().splitlines():
-                if line.strip() and (line[0].isdigit() and (line[1] in ['.', ')'])):
-                    questions.append(line.split(' ', 1)[-1].strip())
-            while len(questions) < num_questions:
-                questions.append("Technical question based on resume.")
-            print(f'Generated Questions: {questions}')
-            session['questions'] = questions
-            session['answers'] = []
-            session['current_index'] = 0
-            session['job_description'] = resume_text[:300]
-            return redirect(url_for('student.meeting'))
-        except Exception as e:
-            logging.error(f'Question generation error: {e}')
-            flash(f'Error generating questions: {e}')
+        # Interview state lives server-side; the cookie only carries its id
+        state = create_state('student', {
+            'questions': [],
+            'question_stream_id': None,
+            'questions_total': num_questions,
+            'answers': [],
+            'current_index': 0,
+            'evaluation_key': uuid.uuid4().hex,
+            'job_description': resume_text[:300],
+        })
+        # Questions are streamed in the background and stored on the state row as they arrive;
+        # the meeting serves each one as soon as it exists, from whichever process gets the request.
+        # Not cached: repeat practice runs on the same resume should get fresh questions.
+        state['question_stream_id'] = start_question_stream(
+            prompt, num_questions, fallback="Technical question based on resume.",
+            on_question=store_streamed_questions(current_app._get_current_object(), current_state_id('student'))
+        )
+        save_state('student', state)
+        return redirect(url_for('student.meeting'))
 
     return render_template('student/resume_interview.html')
 
@@ -152,7 +149,7 @@ def student_interview():
 def meeting():
     if not current_user.is_student():
         abort(403)
-    if 'questions' not in session:
+    if get_state('student') is None:
         return redirect(url_for('student.student_home'))
     return render_template('student/student_meeting.html', is_hr_session=False, job_description=current_user.email)
 
@@ -162,19 +159,44 @@ def meeting():
 def get_next_question():
     if not current_user.is_student():
         abort(403)
-    index = session.get('current_index', 0)
-    questions = session.get('questions', [])
+    payload, status = next_question_payload()
+    return jsonify(payload), status
+
+
+def next_question_payload():
+    """Serve the next question as (payload, http_status); shared with the Socket.IO meeting."""
+    state = get_state('student')
+    if state is None:
+        return {"status": "error", "message": "No interview in progress."}, 400
+    index = state['current_index']
+    questions = state['questions']
+    total = state.get('questions_total', len(questions))
+
+    # Read the next question once the background generator has stored it
+    if index >= len(questions) and len(questions) < total:
+        questions = state['questions'] = wait_for_questions(
+            state.get('question_stream_id'), lambda: load_questions('student'), index + 1)
+
     if index >= len(questions):
-        return jsonify({"status": "complete"})
+        return {"status": "complete"}, 200
     
-    response = jsonify({
+    response = {
         "status": "question",
         "question": questions[index],
         "index": index,
-        "total": len(questions)
-    }) 
-    session['current_index'] = index + 1
-    return response
+        "total": total
+    }
+    state['current_index'] = index + 1
+    save_state('student', state)
+    return response, 200
+
+def store_streamed_questions(app, state_id):
+    """Callback that saves the questions streamed in so far on the interview state row."""
+    def store(questions):
+        with app.app_context():
+            store_questions(state_id, questions)
+            db.session.remove()
+    return store
 
 # Submit User Answer (AJAX)
 @student_bp.route('/student/submit_answer', methods=['POST'])
@@ -183,18 +205,36 @@ def submit_answer():
     if not current_user.is_student():
         abort(403)
     data = request.json
-    answer = data.get("answer", "")
-    index = data.get("index", 0)
-    answers = session.get("answers", [])
+    payload, status = record_answer(data.get("index", 0), data.get("answer", ""))
+    return jsonify(payload), status
+
+
+def record_answer(index, answer, on_evaluated=None):
+    """
+    Save the answer to question `index` and start scoring it; returns (payload, http_status).
+    `on_evaluated(progress)` is called once the background evaluation finishes.
+    """
+    state = get_state('student')
+    if state is None:
+        return {"status": "error", "message": "No interview in progress."}, 400
+    answers = state["answers"]
     if index < len(answers):
         answers[index] = answer
         
     else:
         answers.append(answer)
-    session["answers"] = answers
-    session["current_index"] = index + 1
+    state["current_index"] = index + 1
+    save_state('student', state)
+
+    # Score this answer in the background while the candidate moves on
+    questions = state["questions"]
+    if index < len(questions):
+        on_result = None
+        if on_evaluated:
+            on_result = lambda result: on_evaluated({'index': index, 'score': result[1]})
+        submit_evaluation((state["evaluation_key"], index), questions[index], answer, on_result=on_result)
     
-    return jsonify({"status": "complete"})
+    return {"status": "complete"}, 200
 
 
 
@@ -205,17 +245,30 @@ def final_report():
     if not current_user.is_student():
         abort(403)
 
-    questions = session.get('questions', [])
-    answers = session.get('answers', [])
+    state = get_state('student') or {}
+    questions = state.get('questions', [])
+    answers = state.get('answers', [])
 
     if not questions or not answers:
         return jsonify({"status": "error", "message": "No completed interview found."})
 
+    discard_stream(state.get('question_stream_id'))
+    clear_state('student')
+
     report_lines = ""
     total_score = 0
 
-    for i, (question, answer) in enumerate(zip(questions, answers)):
-        ideal_answer, score = evaluate_answer(question, answer)
+    # Answers were scored in the background as they came in; wait for any still in flight
+    # and batch-score whatever is missing (e.g. evaluations that failed or timed out)
+    pairs = list(zip(questions, answers))
+    evaluation_key = state['evaluation_key']
+    results = {index: result for (_, index), result in
+               collect([(evaluation_key, i) for i in range(len(pairs))]).items()}
+    results.update(evaluate_pairs([(i, question, answer) for i, (question, answer) in enumerate(pairs)
+                                   if i not in results]))
+
+    for i, (question, answer) in enumerate(pairs):
+        ideal_answer, score = results.get(i, ("Evaluation not available", 0))
         total_score += score
 
         report_lines += f"""